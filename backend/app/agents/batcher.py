@@ -0,0 +1,124 @@
+"""Micro-batching of concurrent LLM requests.
+
+Under concurrent load every request makes its own small LLM call, each
+paying network and prompt-prefill cost. The BatchScheduler coalesces
+requests that arrive within a short window into one call and fans the
+results back to each waiter. A request that finds no company within the
+window is handed back to its caller to run on its own, so a lone request
+keeps its normal (streamed) path.
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Pending:
+    """One queued request and the future its caller is waiting on."""
+
+    item: Any
+    future: asyncio.Future = field(default_factory=asyncio.Future)
+
+
+class BatchScheduler:
+    """Coalesce concurrent requests into batched calls.
+
+    Args:
+        process: Coroutine taking a list of 2+ items and returning one result
+            per item, in order. A None result sends that item back to its
+            caller to run alone.
+        max_batch: Maximum items per batched call
+        window: Seconds to wait for more items after the first arrives
+        errors: Exception types process is expected to raise (e.g. rate
+            limits, unparsable replies); they are logged and the batch's
+            items run alone. Any other error also sends every item back to
+            run alone, then propagates out of the batch task.
+
+    Example:
+        scheduler = BatchScheduler(synthesize_many, max_batch=8, window=0.05)
+        result = await scheduler.submit(item)
+        if result is None:
+            result = await synthesize_one(item)
+    """
+
+    def __init__(
+        self,
+        process: Callable[[list], Awaitable[list]],
+        max_batch: int = 8,
+        window: float = 0.05,
+        errors: tuple[type[Exception], ...] = (),
+    ):
+        self.process = process
+        self.max_batch = max_batch
+        self.window = window
+        self.errors = errors
+        self._queue: asyncio.Queue[_Pending] | None = None
+        self._worker: asyncio.Task | None = None
+        self._batches: set[asyncio.Task] = set()  # Keep batch tasks referenced
+
+    async def submit(self, item: Any) -> Any | None:
+        """Queue an item and wait for its result.
+
+        Returns:
+            The batched result, or None if the item should be run alone
+            (no other request arrived in time, or the batch failed for it)
+        """
+        if self.max_batch < 2 or self.window <= 0:
+            return None  # Batching disabled
+
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._collect())
+
+        pending = _Pending(item)
+        await self._queue.put(pending)
+        return await pending.future
+
+    async def _collect(self) -> None:
+        """Group queued items into batches and dispatch them."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.window
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except TimeoutError:
+                    break
+
+            if len(batch) == 1:
+                _resolve(batch[0], None)  # Nobody to batch with
+                continue
+
+            task = asyncio.create_task(self._run_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _run_batch(self, batch: list[_Pending]) -> None:
+        """Process one batch, falling back to solo runs on failure."""
+        results = []
+        try:
+            results = await self.process([pending.item for pending in batch])
+            logger.info("Processed batch of %d requests", len(batch))
+        except self.errors as e:
+            logger.warning(
+                "Batch of %d failed, running individually: %s", len(batch), e
+            )
+        finally:
+            # Every waiter gets an answer, even if the error is unexpected
+            for i, pending in enumerate(batch):
+                _resolve(pending, results[i] if i < len(results) else None)
+
+
+def _resolve(pending: _Pending, result: Any) -> None:
+    """Set a waiter's result unless its caller has already gone away."""
+    if not pending.future.done():
+        pending.future.set_result(result)
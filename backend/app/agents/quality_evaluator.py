@@ -2,26 +2,148 @@
 
 This agent:
 1. Takes raw studies from Search Agent
-2. Uses Groq to score each study (0-10)
+2. Uses Groq to score each study (0-10), reusing cached scores
+   for studies it has already seen
 3. Considers: study type, sample size, journal, recency
 4. Returns top 5 highest quality studies
 
 Ensures only high-quality evidence is used for final verdict.
 """
 
+import asyncio
+import hashlib
+import heapq
 import json
 import logging
-import re
+import math
+from datetime import datetime
 from typing import List
+import groq
+import orjson
 from langchain_groq import ChatGroq
 from langchain_core.messages import HumanMessage, SystemMessage
+from app.clients import http_client
 from app.config import settings
-from app.utils.retry import invoke_with_retry
+from app.agents.synthesis_agent import build_studies_context
+from app.db.session import AsyncSessionLocal
+from app.services.score_cache import (
+    get_cached_scores,
+    save_scores,
+    study_fingerprint,
+)
+from app.utils.json_stream import JSONArrayStream
+from app.utils.retry import RateLimitExceeded, stream_with_retry
 from app.models.state import VerityState, Study
 
 logger = logging.getLogger(__name__)
 
 
+# Output budget per study: a score delta plus a reason of at most 10 words
+_TOKENS_PER_STUDY = 30
+_MAX_SCORING_TOKENS = 8000
+
+# Studies needing the LLM are split into up to this many concurrent calls,
+# each of at least _MIN_SHARD_SIZE studies, so decode time is divided
+# without multiplying requests against the rate limit
+_MAX_SHARDS = 3
+_MIN_SHARD_SIZE = 5
+
+# Static scoring rubric. Kept at module level so the system prompt is
+# byte-identical on every call and eligible for provider prefix caching;
+# only the per-study user message varies.
+_SCORING_SYSTEM_PROMPT = """You are a scientific quality assessor. You will be given a numbered list of studies, each with a heuristic prior score. Refine the prior for EACH study so the final 0-10 score reflects these criteria:
+
+1. Study Type (40% weight):
+   - Meta-analysis: 9-10 points
+   - Systematic review: 7-8 points
+   - RCT: 6-7 points
+   - Observational/cohort: 3-5 points
+   - Case study/other: 1-3 points
+
+2. Sample Size (30% weight):
+   - n > 1000: full points
+   - n = 500-1000: good points
+   - n = 100-500: moderate points
+   - n < 100: low points
+   - n = 0 (meta-analysis aggregate): moderate points
+
+3. Journal Quality (20% weight):
+   - High-impact journals (Nature, Science, JAMA, BMJ, Lancet): high points
+   - Specialized reputable journals: moderate points
+   - Other journals: low-moderate points
+
+4. Recency (10% weight):
+   - Last 2 years: full points
+   - 2-5 years: good points
+   - 5-10 years: moderate points
+   - 10+ years: low points
+
+The prior only looks at study type, sample size and year. Adjust it for what it misses, such as journal quality and how well the design fits the type.
+
+OUTPUT: Return a JSON array with one object per study, in the SAME order as the input. Each object must have "delta" (number from -2 to +2, added to the prior) and "why" (10 words or fewer).
+
+Example:
+[
+  {"delta": 0.5, "why": "Large meta-analysis in a top journal."},
+  {"delta": -1, "why": "Small RCT in a minor journal."}
+]
+
+Return ONLY the JSON array, no other text."""
+_SCORING_SYSTEM_MESSAGE = SystemMessage(content=_SCORING_SYSTEM_PROMPT)
+
+
+# One entry of the numbered study list in the scoring user message
+_STUDY_TEMPLATE = (
+    "{i}. Title: {title}\n"
+    "   Authors: {authors}\n"
+    "   Journal: {journal}\n"
+    "   Year: {year}\n"
+    "   Type: {study_type}\n"
+    "   Sample Size: {sample_size}\n"
+    "   Prior: {prior}"
+)
+
+
+# Failures worth retrying on the fallback model rather than going heuristic
+_TRANSIENT_ERRORS = (
+    RateLimitExceeded,
+    groq.RateLimitError,
+    groq.APIConnectionError,  # Includes APITimeoutError
+    groq.InternalServerError,
+)
+
+# The LLM may move the heuristic prior by at most this much either way
+_MAX_DELTA = 2.0
+
+# Primary scoring model, and the smaller one used when it is limited or down
+_PRIMARY_MODEL = "llama-3.3-70b-versatile"
+_FALLBACK_MODEL = "llama-3.1-8b-instant"
+
+# Bump when scoring changes in a way the digest below can't see (e.g. the
+# heuristic prior in _fallback_score)
+_RUBRIC_REVISION = 1
+
+# Identifies the scoring setup and is part of every score cache key, so
+# editing the rubric prompt, study template, models or delta cap stops old
+# cached scores from being served
+_SCORING_VERSION = hashlib.blake2b(
+    orjson.dumps(
+        [
+            _RUBRIC_REVISION,
+            _SCORING_SYSTEM_PROMPT,
+            _STUDY_TEMPLATE,
+            _PRIMARY_MODEL,
+            _FALLBACK_MODEL,
+            _MAX_DELTA,
+        ]
+    ),
+    digest_size=8,
+).hexdigest()
+
+# Study types the heuristic scores as well as the LLM does (see _is_confident)
+_CONFIDENT_STUDY_TYPES = {"meta-analysis", "systematic review"}
+
+
 def _fallback_score(study: Study) -> dict:
     """Heuristic score used when the LLM call fails or returns unparseable output."""
     score = 5.0
@@ -44,121 +166,287 @@ def _fallback_score(study: Study) -> dict:
     }
 
 
+def _is_confident(study: Study) -> bool:
+    """Whether the heuristic score is reliable enough to skip the LLM.
+
+    Meta-analyses and systematic reviews land at the top of the rubric
+    regardless of the finer criteria, so a large or recent one gets a
+    near-final heuristic score. Ambiguous types always go to the LLM.
+    """
+    study_type = study.get("study_type", "").lower()
+    if study_type not in _CONFIDENT_STUDY_TYPES:
+        return False
+    return (
+        study.get("sample_size", 0) > 1000
+        or study.get("year", 0) >= datetime.now().year - 2
+    )
+
+
+def _apply_llm_score(study: Study, score) -> Study | None:
+    """Merge one element of the LLM score array onto its study, in place.
+
+    The element holds a delta relative to the heuristic prior; the final
+    score is the prior plus the clipped delta, kept within 0-10.
+
+    Returns None when the element is malformed so the caller can fall back.
+    """
+    if not isinstance(score, dict):
+        return None
+    try:
+        delta = float(score.get("delta", 0))
+    except (TypeError, ValueError):
+        return None
+    delta = max(-_MAX_DELTA, min(_MAX_DELTA, delta))
+    prior = _fallback_score(study)["quality_score"]
+    study.update(
+        quality_score=max(0.0, min(10.0, prior + delta)),
+        quality_rationale=score.get("why", "No rationale provided"),
+    )
+    return study
+
+
 class QualityEvaluator:
     """Agent responsible for scoring and ranking studies by quality.
 
-    Sends all studies in a single LLM call to minimise API round-trips,
-    then falls back to heuristic scoring for any study the LLM missed.
+    Sends studies in a few concurrent batched LLM calls to minimise API
+    round-trips and wall-clock time, streaming each response and merging
+    every score as soon as it is complete.
+    Transient failures fall back to a smaller model, then to heuristic
+    scoring for any study no model scored.
     """
 
     def __init__(self):
-        """Initialize Quality Evaluator with Groq Llama."""
+        """Initialize Quality Evaluator with a primary and a fallback Groq Llama."""
         self.llm = ChatGroq(
-            model="llama-3.3-70b-versatile",
+            model=_PRIMARY_MODEL,
             api_key=settings.groq_api_key,
+            http_async_client=http_client,
+            temperature=0.1,
+        )
+        # Faster, smaller model used when the primary is rate limited or down
+        self.fallback_llm = ChatGroq(
+            model=_FALLBACK_MODEL,
+            api_key=settings.groq_api_key,
+            http_async_client=http_client,
             temperature=0.1,
         )
 
     async def score_all_studies(self, studies: List[Study]) -> List[Study]:
-        """Score all studies in a single LLM call.
+        """Score all studies, calling the LLM only where it adds information.
+
+        Studies whose metadata was scored before are served from the
+        persistent score cache, and high-confidence study types are scored
+        by the heuristic. The rest are scored in up to _MAX_SHARDS concurrent
+        streamed LLM calls and written back to the cache.
 
         Args:
             studies: List of studies to score
 
         Returns:
-            List of studies with quality_score and quality_rationale added
+            The same study dicts, updated in place with quality_score and
+            quality_rationale
         """
         if not studies:
             return []
 
-        logger.info(f"Quality Evaluator: Scoring {len(studies)} studies")
+        fingerprints = [study_fingerprint(study, _SCORING_VERSION) for study in studies]
+        cached = await self._load_cached_scores(fingerprints)
+
+        # Scores are merged into the study dicts in place rather than copied;
+        # slots left as None after the LLM pass fall back to the heuristic
+        scored: List[Study | None] = []
+        misses = []
+        auto_scored = 0
+        for i, (study, fp) in enumerate(zip(studies, fingerprints)):
+            if fp in cached:
+                study.update(cached[fp])
+                scored.append(study)
+            elif not settings.force_llm_scoring and _is_confident(study):
+                study.update(_fallback_score(study))
+                scored.append(study)
+                auto_scored += 1
+            else:
+                scored.append(None)
+                misses.append(i)
+
+        if misses:
+            size = max(_MIN_SHARD_SIZE, math.ceil(len(misses) / _MAX_SHARDS))
+            shards = [misses[i : i + size] for i in range(0, len(misses), size)]
+            shard_results = await asyncio.gather(
+                *(self._score_with_llm([studies[i] for i in shard]) for shard in shards)
+            )
+            llm_results = [result for results in shard_results for result in results]
+
+            new_scores = {}
+            for i, result in zip(misses, llm_results):
+                scored[i] = result
+                if result is not None:
+                    new_scores[fingerprints[i]] = {
+                        "quality_score": result["quality_score"],
+                        "quality_rationale": result["quality_rationale"],
+                    }
+            await self._save_scores(new_scores)
+
+        scored_count = sum(1 for s in scored if s is not None)
+        # One consolidated record per batch
+        logger.info(
+            "Quality Evaluator: scored %d/%d studies (%d from cache, %d by heuristic)",
+            scored_count,
+            len(studies),
+            len(cached),
+            auto_scored,
+        )
 
-        system_prompt = """You are a scientific quality assessor. You will be given a numbered list of studies. Score EACH one from 0-10 based on these criteria:
+        for scored_study, study in zip(scored, studies):
+            if scored_study is None:
+                study.update(_fallback_score(study))
 
-1. Study Type (40% weight):
-   - Meta-analysis: 9-10 points
-   - Systematic review: 7-8 points
-   - RCT: 6-7 points
-   - Observational/cohort: 3-5 points
-   - Case study/other: 1-3 points
+        return studies
 
-2. Sample Size (30% weight):
-   - n > 1000: full points
-   - n = 500-1000: good points
-   - n = 100-500: moderate points
-   - n < 100: low points
-   - n = 0 (meta-analysis aggregate): moderate points
+    async def _score_with_llm(self, studies: List[Study]) -> List[Study | None]:
+        """Score studies with the LLM, degrading through the model chain.
 
-3. Journal Quality (20% weight):
-   - High-impact journals (Nature, Science, JAMA, BMJ, Lancet): high points
-   - Specialized reputable journals: moderate points
-   - Other journals: low-moderate points
+        The primary model is tried first. If it fails with a transient error
+        (rate limit, timeout, connection or server error), the studies it
+        left unscored are retried once on the smaller fallback model before
+        the caller resorts to the heuristic.
 
-4. Recency (10% weight):
-   - Last 2 years: full points
-   - 2-5 years: good points
-   - 5-10 years: moderate points
-   - 10+ years: low points
-
-OUTPUT: Return a JSON array with one object per study, in the SAME order as the input. Each object must have "score" (number) and "rationale" (1-2 sentences).
-
-Example:
-[
-  {"score": 8.5, "rationale": "High-quality meta-analysis with large sample."},
-  {"score": 6.0, "rationale": "Solid RCT but limited sample size."}
-]
-
-Return ONLY the JSON array, no other text."""
+        Args:
+            studies: Studies to score
 
-        # Build the numbered study list for the user message
-        study_lines = []
-        for i, study in enumerate(studies, 1):
-            study_lines.append(
-                f"{i}. Title: {study.get('title', 'N/A')}\n"
-                f"   Authors: {study.get('authors', 'N/A')}\n"
-                f"   Journal: {study.get('journal', 'N/A')}\n"
-                f"   Year: {study.get('year', 'N/A')}\n"
-                f"   Type: {study.get('study_type', 'N/A')}\n"
-                f"   Sample Size: {study.get('sample_size', 0)}"
+        Returns:
+            One entry per study: the scored study, or None if no model
+            returned a usable score for it
+        """
+        scored: List[Study | None] = [None] * len(studies)
+
+        for llm in (self.llm, self.fallback_llm):
+            pending = [i for i, result in enumerate(scored) if result is None]
+            if not pending:
+                break
+
+            batch = [studies[i] for i in pending]
+            results: List[Study | None] = [None] * len(batch)
+            try:
+                await self._score_batch(llm, batch, results)
+                break
+            except _TRANSIENT_ERRORS as e:
+                logger.warning(
+                    "Scoring with %s failed, trying next model: %s", llm.model_name, e
+                )
+            except Exception as e:
+                logger.warning(
+                    "Batch scoring failed, using fallback for unscored studies: %s", e
+                )
+                break
+            finally:
+                # Keep whatever was scored before a failure
+                for i, result in zip(pending, results):
+                    scored[i] = result
+
+        return scored
+
+    async def _score_batch(
+        self, llm: ChatGroq, studies: List[Study], scored: List[Study | None]
+    ) -> None:
+        """Score a batch in a single streamed call, retrying once on bad JSON.
+
+        Raises:
+            Exception: Any non-JSON error from the model, for the caller
+                to decide whether to fall back
+        """
+        # Build the numbered study list for the user message in one pass
+        user_prompt = "Score each of these studies:\n\n" + "\n\n".join(
+            _STUDY_TEMPLATE.format(
+                i=i,
+                title=study.get("title", "N/A"),
+                authors=study.get("authors", "N/A"),
+                journal=study.get("journal", "N/A"),
+                year=study.get("year", "N/A"),
+                study_type=study.get("study_type", "N/A"),
+                sample_size=study.get("sample_size", 0),
+                prior=_fallback_score(study)["quality_score"],
             )
-
-        user_prompt = "Score each of these studies:\n\n" + "\n\n".join(study_lines)
+            for i, study in enumerate(studies, 1)
+        )
 
         messages = [
-            SystemMessage(content=system_prompt),
+            _SCORING_SYSTEM_MESSAGE,
             HumanMessage(content=user_prompt),
         ]
 
+        for attempt in range(2):
+            try:
+                await self._stream_scores(llm, messages, studies, scored)
+                return
+            except json.JSONDecodeError as e:
+                if attempt == 0:
+                    logger.warning("Scoring returned invalid JSON, retrying: %s", e)
+                    continue
+                logger.warning(
+                    "Batch scoring failed, using fallback for unscored studies: %s", e
+                )
+
+    async def _stream_scores(
+        self,
+        llm: ChatGroq,
+        messages: list,
+        studies: List[Study],
+        scored: List[Study | None],
+    ) -> None:
+        """Stream the score array, filling ``scored`` as each element closes.
+
+        Output is capped at roughly 30 tokens per study. If the cap truncates
+        the array, every element completed before the cut is still used.
+
+        Raises:
+            json.JSONDecodeError: If no usable score could be parsed
+        """
+        parser = JSONArrayStream()
+        received = 0
+        max_tokens = min(_MAX_SCORING_TOKENS, _TOKENS_PER_STUDY * len(studies))
+        async for text in stream_with_retry(llm, messages, max_tokens=max_tokens):
+            for score in parser.feed(text):
+                if received < len(studies):
+                    scored[received] = _apply_llm_score(studies[received], score)
+                received += 1
+
+        if parser.closed:
+            return
+
+        # The array never closed: either the output hit max_tokens or it is
+        # malformed. Try the outermost brackets of the full buffer, and if
+        # that fails keep the elements that were already complete.
+        buffer = parser.buffer
         try:
-            response = await invoke_with_retry(self.llm, messages)
-            content = re.sub(r"```(?:json)?\s*|\s*```", "", response.content).strip()
-            scores = json.loads(content)
-
-            if not isinstance(scores, list):
-                raise ValueError("Response is not a JSON array")
-
-            # Map scores back onto studies; fall back per-study if the array is short
-            scored_studies = []
-            for i, study in enumerate(studies):
-                if i < len(scores) and isinstance(scores[i], dict):
-                    scored_studies.append(
-                        {
-                            **study,
-                            "quality_score": float(scores[i].get("score", 0)),
-                            "quality_rationale": scores[i].get(
-                                "rationale", "No rationale provided"
-                            ),
-                        }
-                    )
-                else:
-                    scored_studies.append({**study, **_fallback_score(study)})
-
-            logger.info(f"Scored {len(scored_studies)}/{len(studies)} studies")
-            return scored_studies
+            scores = orjson.loads(buffer[buffer.find("[") : buffer.rfind("]") + 1])
+        except json.JSONDecodeError:
+            if received:
+                logger.info("Score output truncated after %d studies", received)
+                return
+            raise
+
+        for i, score in enumerate(scores[: len(studies)]):
+            scored[i] = _apply_llm_score(studies[i], score)
+
+    async def _load_cached_scores(self, fingerprints: List[str]) -> dict:
+        """Look up cached scores; a cache failure only costs an LLM call."""
+        try:
+            async with AsyncSessionLocal() as db:
+                return await get_cached_scores(db, fingerprints)
+        except Exception as e:
+            logger.warning("Score cache lookup failed: %s", e)
+            return {}
 
+    async def _save_scores(self, scores: dict) -> None:
+        """Persist freshly scored studies; failures are logged and ignored."""
+        if not scores:
+            return
+        try:
+            async with AsyncSessionLocal() as db:
+                await save_scores(db, scores)
         except Exception as e:
-            logger.warning(f"Batch scoring failed, using fallback for all studies: {e}")
-            return [{**study, **_fallback_score(study)} for study in studies]
+            logger.warning("Score cache write failed: %s", e)
 
     def rank_studies(self, scored_studies: List[Study], top_n: int = 5) -> List[Study]:
         """Rank studies by quality score and return top N.
@@ -170,13 +458,11 @@ Return ONLY the JSON array, no other text."""
         Returns:
             Top N studies sorted by quality_score (descending)
         """
-        # Sort by quality_score (descending)
-        ranked = sorted(
-            scored_studies, key=lambda s: s.get("quality_score", 0), reverse=True
+        # Partial selection: O(N log k) without sorting the whole list
+        return heapq.nlargest(
+            top_n, scored_studies, key=lambda s: s.get("quality_score", 0)
         )
 
-        return ranked[:top_n]
-
     async def run(self, state: VerityState) -> VerityState:
         """Execute Quality Evaluator node in LangGraph workflow.
 
@@ -184,13 +470,14 @@ Return ONLY the JSON array, no other text."""
             state: Current graph state with 'raw_studies' field
 
         Returns:
-            Updated state with scored_studies and top_studies added
+            State update with scored_studies, top_studies and the synthesis
+            prompt block for the top studies (studies_context)
         """
         raw_studies = state.get("raw_studies", [])
 
         if not raw_studies:
             logger.warning("No studies to evaluate")
-            return {**state, "scored_studies": [], "top_studies": []}
+            return {"scored_studies": [], "top_studies": []}
 
         try:
             # Step 1: Score all studies
@@ -199,31 +486,49 @@ Return ONLY the JSON array, no other text."""
             # Step 2: Rank and select top studies
             top_studies = self.rank_studies(scored_studies, top_n=5)
 
-            logger.info(f"Selected top {len(top_studies)} studies")
+            logger.info("Selected top %d studies", len(top_studies))
 
-            # Return updated state
+            # Return only the updated keys; LangGraph merges them into state
             return {
-                **state,
                 "scored_studies": scored_studies,
                 "top_studies": top_studies,
+                "studies_context": build_studies_context(
+                    state.get("claim", ""), top_studies
+                ),
             }
 
         except Exception as e:
-            logger.error(f"Quality Evaluator failed: {e}")
+            logger.error("Quality Evaluator failed: %s", e)
             # Return studies with fallback scores if evaluation fails
-            fallback_studies = [{**s, **_fallback_score(s)} for s in raw_studies]
+            for study in raw_studies:
+                study.update(_fallback_score(study))
+            top_studies = self.rank_studies(raw_studies, top_n=5)
             return {
-                **state,
-                "scored_studies": fallback_studies,
-                "top_studies": self.rank_studies(fallback_studies, top_n=5),
+                "scored_studies": raw_studies,
+                "top_studies": top_studies,
+                "studies_context": build_studies_context(
+                    state.get("claim", ""), top_studies
+                ),
             }
 
 
+# Reused across graph invocations instead of rebuilding clients per request
+_evaluator: QualityEvaluator | None = None
+
+
+def _get_evaluator() -> QualityEvaluator:
+    """Return the process-wide QualityEvaluator, creating it on first use."""
+    global _evaluator
+    if _evaluator is None:
+        _evaluator = QualityEvaluator()
+    return _evaluator
+
+
 # Node function for LangGraph
 async def quality_evaluator_node(state: VerityState) -> VerityState:
     """LangGraph node wrapper for Quality Evaluator.
 
-    This function is called by LangGraph during workflow execution.
+    This function is called by LangGraph during workflow execution. The
+    agent is created once and reused so its LLM client stays warm.
     """
-    evaluator = QualityEvaluator()
-    return await evaluator.run(state)
+    return await _get_evaluator().run(state)
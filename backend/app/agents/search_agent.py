@@ -9,10 +9,13 @@ Designed to find high-quality evidence: meta-analyses, RCTs, systematic reviews.
 """
 
 import asyncio
+import json
 import logging
 from typing import List
+import orjson
 from langchain_groq import ChatGroq
 from langchain_core.messages import HumanMessage, SystemMessage
+from app.clients import http_client
 from app.config import settings
 from app.models.state import VerityState
 from app.tools.pubmed import PubMedTool
@@ -22,9 +25,47 @@ from app.utils.sanitize import (
     wrap_user_content,
     get_security_instruction,
 )
+from app.utils.semantic_cache import SemanticCache
 
 logger = logging.getLogger(__name__)
 
+# Static instructions, built once at import so the system prompt is
+# byte-identical on every call and Groq can serve it from its prompt cache.
+# Only the claim in the user message varies.
+_SEARCH_SYSTEM_PROMPT = """You are a PubMed search expert. Generate 2-3 optimized search queries to find high-quality evidence about a health claim.
+
+PUBMED QUERY RULES:
+1. Keep queries SHORT and focused (3-5 key terms)
+2. Use ONE study type per query (meta-analysis, systematic review, or RCT)
+3. NEVER use OR within a query - it causes unexpected results
+4. Use PubMed field tags for precision:
+   - [Title/Abstract] for key terms
+   - [pt] for publication types (meta-analysis[pt], randomized controlled trial[pt])
+5. Use scientific terminology (e.g., "resistance training" not "working out")
+
+GOOD EXAMPLES:
+- creatine muscle strength meta-analysis[pt]
+- creatine supplementation resistance training randomized controlled trial[pt]
+- vitamin D bone density systematic review[pt]
+
+BAD EXAMPLES (avoid these patterns):
+- creatine meta-analysis OR systematic review (OR causes issues)
+- creatine supplementation muscle strength gains ergogenic effect (too many terms)
+
+OUTPUT FORMAT (JSON only, no explanation):
+{
+  "queries": [
+    "query 1",
+    "query 2",
+    "query 3"
+  ]
+}
+""" + get_security_instruction()
+_SEARCH_SYSTEM_MESSAGE = SystemMessage(content=_SEARCH_SYSTEM_PROMPT)
+
+# Generated queries for recently seen claims, matched on their content words
+_query_cache = SemanticCache()
+
 
 class SearchAgent:
     """Agent responsible for finding relevant PubMed studies.
@@ -34,11 +75,19 @@ class SearchAgent:
     """
 
     def __init__(self):
-        """Initialize Search Agent with Groq Llama."""
+        """Initialize Search Agent with Groq Llama.
+
+        Query generation only emits a few short strings as JSON, so the
+        small 8B model is used with a tight output limit.
+        """
         self.llm = ChatGroq(
-            model="llama-3.3-70b-versatile",
+            model="llama-3.1-8b-instant",
             api_key=settings.groq_api_key,
-            temperature=0.3,
+            http_async_client=http_client,
+            temperature=0,
+            max_tokens=256,
+            # JSON mode guarantees parseable output, no fence stripping needed
+            model_kwargs={"response_format": {"type": "json_object"}},
         )
         self.pubmed = PubMedTool()
 
@@ -59,35 +108,10 @@ class SearchAgent:
                 "creatine ergogenic aid systematic review"
             ]
         """
-        system_prompt = """You are a PubMed search expert. Generate 2-3 optimized search queries to find high-quality evidence about a health claim.
-
-PUBMED QUERY RULES:
-1. Keep queries SHORT and focused (3-5 key terms)
-2. Use ONE study type per query (meta-analysis, systematic review, or RCT)
-3. NEVER use OR within a query - it causes unexpected results
-4. Use PubMed field tags for precision:
-   - [Title/Abstract] for key terms
-   - [pt] for publication types (meta-analysis[pt], randomized controlled trial[pt])
-5. Use scientific terminology (e.g., "resistance training" not "working out")
-
-GOOD EXAMPLES:
-- creatine muscle strength meta-analysis[pt]
-- creatine supplementation resistance training randomized controlled trial[pt]
-- vitamin D bone density systematic review[pt]
-
-BAD EXAMPLES (avoid these patterns):
-- creatine meta-analysis OR systematic review (OR causes issues)
-- creatine supplementation muscle strength gains ergogenic effect (too many terms)
-
-OUTPUT FORMAT (JSON only, no explanation):
-{
-  "queries": [
-    "query 1",
-    "query 2",
-    "query 3"
-  ]
-}
-""" + get_security_instruction()
+        cached = _query_cache.get(claim)
+        if cached is not None:
+            logger.info("Query cache hit, skipping query generation")
+            return list(cached)
 
         # Security: Sanitize and wrap the claim
         sanitized_claim = sanitize_claim(claim)
@@ -97,68 +121,78 @@ OUTPUT FORMAT (JSON only, no explanation):
 {wrapped_claim}"""
 
         messages = [
-            SystemMessage(content=system_prompt),
+            _SEARCH_SYSTEM_MESSAGE,
             HumanMessage(content=user_prompt),
         ]
 
         try:
-            response = await invoke_with_retry(self.llm, messages)
-
-            # Parse JSON response
-            import json
-
-            # Extract JSON from response (handle potential markdown code blocks)
-            content = response.content
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0].strip()
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0].strip()
-
-            result = json.loads(content)
+            result = await self._invoke_json(messages)
             queries = result.get("queries", [])
 
             # Fallback if parsing fails
             if not queries:
-                queries = [f"{claim} meta-analysis systematic review"]
+                return [f"{sanitized_claim} meta-analysis systematic review"]
 
-            return queries[:3]  # Max 3 queries
+            queries = queries[:3]  # Max 3 queries
+            _query_cache.put(claim, queries)
+            return queries
 
         except Exception as e:
             # Fallback query if LLM fails
-            logger.warning(f"Query generation failed: {e}")
-            sanitized = sanitize_claim(claim)
-            return [f"{sanitized} meta-analysis", f"{sanitized} systematic review"]
+            logger.warning("Query generation failed: %s", e)
+            return [
+                f"{sanitized_claim} meta-analysis",
+                f"{sanitized_claim} systematic review",
+            ]
+
+    async def _invoke_json(self, messages: list) -> dict:
+        """Invoke the LLM in JSON mode, retrying once on unparseable output."""
+        for attempt in range(2):
+            response = await invoke_with_retry(self.llm, messages)
 
-    async def search_studies(self, queries: List[str], max_per_query: int = 6) -> List:
+            usage = response.usage_metadata or {}
+            logger.debug(
+                "Query generation tokens: %d input (%d cached)",
+                usage.get("input_tokens", 0),
+                usage.get("input_token_details", {}).get("cache_read", 0),
+            )
+
+            try:
+                # orjson.JSONDecodeError subclasses json.JSONDecodeError
+                return orjson.loads(response.content)
+            except json.JSONDecodeError:
+                if attempt == 1:
+                    raise
+                logger.warning("Query generation returned invalid JSON, retrying")
+
+    async def search_studies(
+        self,
+        queries: List[str],
+        max_per_query: int = 6,
+        max_concurrent: int | None = None,
+        limiter: asyncio.Semaphore | None = None,
+    ) -> List:
         """Execute PubMed searches for all queries in parallel.
 
         Args:
             queries: List of search queries
             max_per_query: Maximum results per query (default: 6)
+            max_concurrent: Maximum searches in flight at once
+                (default: settings.pubmed_max_concurrency)
+            limiter: Semaphore shared with other searches for the same
+                request, used instead of max_concurrent
 
         Returns:
-            List of Study objects with metadata
+            List of Study objects with metadata, deduplicated by pubmed_id
         """
-        # Execute all searches in parallel
-        tasks = [
-            self.pubmed.search_and_fetch(query, max_results=max_per_query)
-            for query in queries
-        ]
-
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # Flatten results and deduplicate by pubmed_id
-        all_studies = []
-        seen_ids = set()
-
-        for result in results:
-            if isinstance(result, list):  # Skip exceptions
-                for study in result:
-                    if study["pubmed_id"] not in seen_ids:
-                        all_studies.append(study)
-                        seen_ids.add(study["pubmed_id"])
-
-        return all_studies
+        # The searches share one efetch for all their IDs, so each study is
+        # fetched once however many queries found it
+        return await self.pubmed.search_many(
+            queries,
+            max_results=max_per_query,
+            max_concurrent=max_concurrent,
+            limiter=limiter,
+        )
 
     async def run(self, state: VerityState) -> VerityState:
         """Execute Search Agent node in LangGraph workflow.
@@ -167,12 +201,29 @@ OUTPUT FORMAT (JSON only, no explanation):
             state: Current graph state with 'claim' field
 
         Returns:
-            Updated state with search_queries and raw_studies added
+            State update with search_queries and raw_studies
         """
         claim = state.get("claim", "")
 
         if not claim:
-            return {**state, "search_error": "No claim provided"}
+            return {"search_error": "No claim provided"}
+
+        # Every PubMed search for this request, speculative or tailored,
+        # counts against one concurrency limit
+        limiter = asyncio.Semaphore(settings.pubmed_max_concurrency)
+
+        # Speculatively search a generic query while the LLM is still
+        # generating the tailored ones, hiding one LLM round-trip
+        speculative = asyncio.create_task(
+            self.pubmed.search_many(
+                [f"{sanitize_claim(claim)} meta-analysis systematic review"],
+                max_results=6,
+                limiter=limiter,
+            )
+        )
+        # Its failure is never awaited when the tailored path fails first,
+        # so retrieve it here rather than leave it unretrieved
+        speculative.add_done_callback(_retrieve_exception)
 
         try:
             logger.info("Search Agent: Analyzing claim")
@@ -180,32 +231,61 @@ OUTPUT FORMAT (JSON only, no explanation):
             # Step 1: Generate optimized queries
             logger.info("Generating PubMed search queries...")
             queries = await self.generate_queries(claim)
-            logger.info(f"Generated {len(queries)} queries")
+            logger.info("Generated %d queries", len(queries))
 
-            # Step 2: Execute searches
+            # Step 2: Run the tailored searches. If the speculative search
+            # already finished by then, its results are kept as a safety net
+            # and merged in; if it is still running it is cancelled below.
             logger.info("Searching PubMed...")
-            studies = await self.search_studies(queries)
-            logger.info(f"Found {len(studies)} unique studies")
-
-            # Return updated state
-            # Note: search_queries and raw_studies use 'add' operator, so they append
+            studies = await self.search_studies(queries, limiter=limiter)
+
+            # Tailored results first; speculative ones only fill in new studies
+            if speculative.done() and speculative.exception() is None:
+                by_id = {study["pubmed_id"]: study for study in studies}
+                for study in speculative.result():
+                    by_id.setdefault(study["pubmed_id"], study)
+                studies = list(by_id.values())
+            logger.info("Found %d unique studies", len(studies))
+
+            # Return only the updated keys; LangGraph merges them into state.
+            # search_queries and raw_studies use the 'add' reducer, so they append
             return {
-                **state,
                 "search_queries": queries,
                 "raw_studies": studies,
                 "search_error": None,  # Only set for actual errors, not empty results
             }
 
         except Exception as e:
-            logger.error(f"Search Agent failed: {e}")
-            return {**state, "search_error": str(e)}
+            logger.error("Search Agent failed: %s", e)
+            return {"search_error": str(e)}
+
+        finally:
+            speculative.cancel()  # No-op once it has finished
+
+
+def _retrieve_exception(task: asyncio.Task) -> None:
+    """Done callback marking a background task's exception as retrieved."""
+    if not task.cancelled() and task.exception() is not None:
+        logger.debug("Speculative search failed: %s", task.exception())
+
+
+# Reused across graph invocations instead of rebuilding clients per request
+_agent: SearchAgent | None = None
+
+
+def _get_agent() -> SearchAgent:
+    """Return the process-wide SearchAgent, creating it on first use."""
+    global _agent
+    if _agent is None:
+        _agent = SearchAgent()
+    return _agent
 
 
 # Node function for LangGraph
 async def search_node(state: VerityState) -> VerityState:
     """LangGraph node wrapper for Search Agent.
 
-    This function is called by LangGraph during workflow execution.
+    This function is called by LangGraph during workflow execution. The
+    agent is created once and reused so its LLM client stays warm.
     """
-    agent = SearchAgent()
-    return await agent.run(state)
+    return await _get_agent().run(state)
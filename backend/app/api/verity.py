@@ -2,17 +2,27 @@
 
 import time
 import logging
+import orjson
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
 from typing import List
-from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.graph import run_verity
+from app.config import settings
+from app.graph import run_verity, stream_verity
 from app.models.state import Study
-from app.db.session import get_db
-from app.services.cache import get_cached_result, save_to_cache
+from app.db.session import AsyncSessionLocal
+from app.services.cache import (
+    get_cached_result,
+    get_hot_response,
+    put_hot_response,
+    save_to_cache,
+)
 from app.services.claim_validator import validate_claim, ClaimValidationError
+from app.services.jobs import JobFailed, JobQueue
+from app.services.singleflight import SingleFlight
 from app.utils.retry import RateLimitExceeded
+from app.utils.normalize import hash_claim, normalize_claim
 from app.utils.rate_limit import rate_limit
 
 logger = logging.getLogger(__name__)
@@ -81,14 +91,265 @@ class VerifyClaimResponse(BaseModel):
         }
 
 
+_NO_STUDIES_SUMMARY = "No peer-reviewed studies were found on PubMed for this specific topic. This doesn't mean the claim is false — it may just be too new, too specific, or not yet well-researched. Try rephrasing with broader terms."
+
+_RATE_LIMITED_DETAIL = {
+    "message": "Verity is temporarily unavailable due to high demand. Please try again in about a minute.",
+    "retry_after": 60,
+}
+
+
+async def _validate_or_400(claim: str) -> None:
+    """Validate the claim is specific enough, raising a 400 with suggestions."""
+    try:
+        await validate_claim(claim)
+    except ClaimValidationError as e:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error": "Claim is too vague",
+                "message": e.message,
+                "suggestions": e.suggestions,
+            },
+        )
+
+
+# Study fields included in responses (the abstract is left out)
+_STUDY_RESPONSE_FIELDS = (
+    "pubmed_id",
+    "title",
+    "authors",
+    "journal",
+    "year",
+    "study_type",
+    "sample_size",
+    "url",
+)
+
+
+def _cached_response(cached) -> bytes:
+    """Return the encoded response body for a cache hit.
+
+    Entries saved with their serialized body are returned as stored, with
+    no decoding or re-encoding; older entries are rebuilt from columns.
+    """
+    if cached.response_json is not None:
+        return cached.response_json
+    return orjson.dumps(
+        {
+            "claim": cached.original_claim,
+            "verdict": cached.verdict,
+            "verdict_emoji": cached.verdict_emoji,
+            "summary": cached.summary,
+            "top_studies": cached.studies_json,
+            "search_queries": [],  # Not stored in older entries
+            "stats": cached.stats,
+            "cache_hit": True,
+        }
+    )
+
+
+def _pipeline_response(claim: str, result: dict) -> dict:
+    """Build the response body from the pipeline's final state.
+
+    Bodies are plain dicts in the shape of VerifyClaimResponse. The pipeline
+    has already validated every study, so they are serialized directly
+    rather than re-validated through the response model.
+
+    Raises:
+        HTTPException: 500 if the search step failed
+    """
+    # Check if we got an error
+    if result.get("search_error"):
+        raise HTTPException(
+            status_code=500, detail=f"Search failed: {result['search_error']}"
+        )
+
+    # Handle case where no studies were found
+    if not result.get("raw_studies"):
+        return {
+            "claim": result.get("claim", claim),
+            "verdict": "Inconclusive",
+            "verdict_emoji": "🔍",
+            "summary": _NO_STUDIES_SUMMARY,
+            "top_studies": [],
+            "search_queries": result.get("search_queries", []),
+            "stats": {
+                "studies_found": 0,
+                "studies_scored": 0,
+                "top_studies_count": 0,
+            },
+            "cache_hit": False,
+        }
+
+    # Format top studies for response
+    top_studies = [
+        {
+            **{key: study[key] for key in _STUDY_RESPONSE_FIELDS},
+            "abstract": None,
+            "quality_score": study.get("quality_score"),
+            "quality_rationale": study.get("quality_rationale"),
+        }
+        for study in result.get("top_studies", [])
+    ]
+
+    # Build response
+    return {
+        "claim": result["claim"],
+        "verdict": result.get("verdict", "Inconclusive"),
+        "verdict_emoji": result.get("verdict_emoji", "❓"),
+        "summary": result.get("summary", "No summary available"),
+        "top_studies": top_studies,
+        "search_queries": result.get("search_queries", []),
+        "stats": {
+            "studies_found": len(result.get("raw_studies", [])),
+            "studies_scored": len(result.get("scored_studies", [])),
+            "top_studies_count": len(top_studies),
+        },
+        "cache_hit": False,
+    }
+
+
+# Routes open a short-lived session for the cache lookup and another for the
+# cache write, so no pooled connection is held while the pipeline runs.
+
+
+async def _lookup_cache(claim: str) -> bytes | None:
+    """Return the encoded cached response body for a claim, if fresh.
+
+    The in-process tier is checked first; SQLite hits are promoted into it.
+    """
+    response = get_hot_response(claim)
+    if response is not None:
+        return response
+
+    async with AsyncSessionLocal() as db:
+        cached = await get_cached_result(db, claim)
+    if cached is None:
+        return None
+
+    response = _cached_response(cached)
+    put_hot_response(claim, response)
+    return response
+
+
+async def _cached_or_validated(claim: str, route: str) -> bytes | None:
+    """Return the cached body for a claim, validating the claim on a miss.
+
+    For routes that check the claim before starting their own work; errors
+    are mapped as /verify maps them.
+
+    Raises:
+        HTTPException: 400 if the claim is too vague, 503 if the validator
+            is rate limited, 500 on any other failure
+    """
+    try:
+        # Cached claims were validated when first verified
+        cached = await _lookup_cache(claim)
+        if cached is None:
+            await _validate_or_400(claim)
+        return cached
+    except HTTPException:
+        raise
+    except RateLimitExceeded:
+        raise HTTPException(status_code=503, detail=_RATE_LIMITED_DETAIL)
+    except Exception:
+        logger.exception("Unhandled error in %s", route)
+        raise HTTPException(
+            status_code=500, detail="Something went wrong. Please try again later."
+        )
+
+
+async def _save_response(claim: str, response: dict, execution_time: float) -> None:
+    """Cache a pipeline response. Responses without studies are not cached."""
+    if not response["top_studies"]:
+        return
+    # Serialized once here; every later hit is served from these bytes
+    body = orjson.dumps({**response, "cache_hit": True})
+    put_hot_response(claim, body)
+    async with AsyncSessionLocal() as db:
+        await save_to_cache(
+            db=db,
+            claim=claim,
+            verdict=response["verdict"],
+            verdict_emoji=response["verdict_emoji"],
+            summary=response["summary"],
+            top_studies=response["top_studies"],
+            search_queries=response["search_queries"],
+            stats=response["stats"],
+            execution_time=execution_time,
+            response_json=body,
+        )
+
+
+# Pipeline runs in flight, keyed by normalized claim hash
+_inflight = SingleFlight()
+
+
+async def _run_pipeline(claim: str) -> bytes:
+    """Run the pipeline for an uncached claim and return the encoded body.
+
+    Runs once per claim: duplicate requests arriving meanwhile share the
+    same run's body (or error) instead of starting their own.
+
+    Raises:
+        HTTPException: 500 if the search step failed
+    """
+    key = hash_claim(normalize_claim(claim)).hex()
+    return await _inflight.do(key, lambda: _run_pipeline_once(claim))
+
+
+async def _run_pipeline_once(claim: str) -> bytes:
+    """Run the pipeline and cache its response (see _run_pipeline)."""
+    # A run that finished just before this one started has already cached it
+    cached = get_hot_response(claim)
+    if cached is not None:
+        return cached
+
+    start_time = time.time()
+    result = await run_verity(claim)
+    execution_time = time.time() - start_time
+
+    response = _pipeline_response(claim, result)
+
+    # Save to cache
+    if result.get("cacheable", True):
+        await _save_response(claim, response, execution_time)
+
+    return orjson.dumps(response)
+
+
+async def _run_job(claim: str) -> bytes:
+    """Verify a claim for a background job, mapping errors as /verify does."""
+    try:
+        return await _run_pipeline(claim)
+    except HTTPException as e:
+        raise JobFailed({"status": e.status_code, "detail": e.detail})
+    except RateLimitExceeded:
+        raise JobFailed({"status": 503, "detail": _RATE_LIMITED_DETAIL})
+
+
+# Started and stopped by the app lifespan
+jobs = JobQueue(_run_job, workers=settings.verify_job_workers)
+
+
+def _sse(event: str, data) -> bytes:
+    """Encode one server-sent event; bytes data is taken as encoded JSON."""
+    payload = data if isinstance(data, bytes) else orjson.dumps(data)
+    return b"event: " + event.encode() + b"\ndata: " + payload + b"\n\n"
+
+
 @router.post(
-    "/verify", response_model=VerifyClaimResponse, dependencies=[Depends(rate_limit)]
+    "/verify",
+    response_class=ORJSONResponse,
+    responses={200: {"model": VerifyClaimResponse}},  # Documented, not enforced
+    dependencies=[Depends(rate_limit)],
 )
-async def verify_claim(request: VerifyClaimRequest, db: AsyncSession = Depends(get_db)):
+async def verify_claim(request: VerifyClaimRequest):
     """Verify a health claim using evidence from PubMed.
 
-    This endpoint first validates the claim is specific enough, then checks
-    the cache for a recent result. If not found or expired, it orchestrates
+    This endpoint first checks the cache for a recent result. If not found
+    or expired, it validates the claim is specific enough, then orchestrates
     the full Verity pipeline:
     1. Search Agent: Finds relevant studies from PubMed
     2. Quality Evaluator: Scores and ranks studies
@@ -101,121 +362,22 @@ async def verify_claim(request: VerifyClaimRequest, db: AsyncSession = Depends(g
         400: If the claim is too vague (includes suggestions)
     """
     try:
-        # Validate claim is specific enough
-        try:
-            await validate_claim(request.claim)
-        except ClaimValidationError as e:
-            raise HTTPException(
-                status_code=400,
-                detail={
-                    "error": "Claim is too vague",
-                    "message": e.message,
-                    "suggestions": e.suggestions,
-                },
-            )
-
-        # Check cache first
-        cached = await get_cached_result(db, request.claim)
+        # Check cache first; cached claims were validated when first verified
+        cached = await _lookup_cache(request.claim)
         if cached is not None:
-            # Return cached result
-            top_studies = [Study(**study) for study in cached.studies_json]
-            return VerifyClaimResponse(
-                claim=cached.original_claim,
-                verdict=cached.verdict,
-                verdict_emoji=cached.verdict_emoji,
-                summary=cached.summary,
-                top_studies=top_studies,
-                search_queries=[],  # Not stored in cache
-                stats=cached.stats,
-                cache_hit=True,
-            )
-
-        # Cache miss - run the Verity pipeline
-        start_time = time.time()
-        result = await run_verity(request.claim)
-        execution_time = time.time() - start_time
-
-        # Check if we got an error
-        if result.get("search_error"):
-            raise HTTPException(
-                status_code=500, detail=f"Search failed: {result['search_error']}"
-            )
+            return Response(cached, media_type="application/json")
 
-        # Handle case where no studies were found
-        if not result.get("raw_studies"):
-            return VerifyClaimResponse(
-                claim=result.get("claim", request.claim),
-                verdict="Inconclusive",
-                verdict_emoji="🔍",
-                summary="No peer-reviewed studies were found on PubMed for this specific topic. This doesn't mean the claim is false — it may just be too new, too specific, or not yet well-researched. Try rephrasing with broader terms.",
-                top_studies=[],
-                search_queries=result.get("search_queries", []),
-                stats={
-                    "studies_found": 0,
-                    "studies_scored": 0,
-                    "top_studies_count": 0,
-                },
-                cache_hit=False,
-            )
-
-        # Format top studies for response
-        top_studies = [
-            Study(
-                pubmed_id=study["pubmed_id"],
-                title=study["title"],
-                authors=study["authors"],
-                journal=study["journal"],
-                year=study["year"],
-                study_type=study["study_type"],
-                sample_size=study["sample_size"],
-                url=study["url"],
-                quality_score=study.get("quality_score"),
-                quality_rationale=study.get("quality_rationale"),
-            )
-            for study in result.get("top_studies", [])
-        ]
-
-        # Build response
-        response = VerifyClaimResponse(
-            claim=result["claim"],
-            verdict=result.get("verdict", "Inconclusive"),
-            verdict_emoji=result.get("verdict_emoji", "❓"),
-            summary=result.get("summary", "No summary available"),
-            top_studies=top_studies,
-            search_queries=result.get("search_queries", []),
-            stats={
-                "studies_found": len(result.get("raw_studies", [])),
-                "studies_scored": len(result.get("scored_studies", [])),
-                "top_studies_count": len(top_studies),
-            },
-            cache_hit=False,
-        )
-
-        # Save to cache
-        await save_to_cache(
-            db=db,
-            claim=request.claim,
-            verdict=response.verdict,
-            verdict_emoji=response.verdict_emoji,
-            summary=response.summary,
-            top_studies=[study.model_dump() for study in top_studies],
-            search_queries=response.search_queries,
-            stats=response.stats,
-            execution_time=execution_time,
-        )
+        # Validate claim is specific enough
+        await _validate_or_400(request.claim)
 
-        return response
+        # Cache miss - run the Verity pipeline
+        body = await _run_pipeline(request.claim)
+        return Response(body, media_type="application/json")
 
     except HTTPException:
         raise
     except RateLimitExceeded:
-        raise HTTPException(
-            status_code=503,
-            detail={
-                "message": "Verity is temporarily unavailable due to high demand. Please try again in about a minute.",
-                "retry_after": 60,
-            },
-        )
+        raise HTTPException(status_code=503, detail=_RATE_LIMITED_DETAIL)
     except Exception:
         logger.exception("Unhandled error in /verify")
         raise HTTPException(
@@ -223,6 +385,96 @@ async def verify_claim(request: VerifyClaimRequest, db: AsyncSession = Depends(g
         )
 
 
+@router.post("/verify/stream", dependencies=[Depends(rate_limit)])
+async def verify_claim_stream(request: VerifyClaimRequest):
+    """Verify a health claim, streaming the verdict as server-sent events.
+
+    The cache lookup and, on a miss, validation happen before the stream
+    opens, so a vague claim still gets a 400 (and a validator failure the
+    503 or 500 that ``/verify`` returns). The stream then carries:
+    - ``field`` events, one per verdict field as the Synthesis Agent
+      completes it ({"field": ..., "value": ...})
+    - one final ``result`` event with the same body as ``/verify``
+    - or one ``error`` event ({"status": ..., "detail": ...}) on failure
+
+    A cache hit sends only the ``result`` event.
+    """
+    cached = await _cached_or_validated(request.claim, "/verify/stream")
+
+    async def events():
+        if cached is not None:
+            yield _sse("result", cached)
+            return
+
+        try:
+            start_time = time.time()
+            async for kind, data in stream_verity(request.claim):
+                if kind == "field":
+                    yield _sse("field", data)
+                    continue
+
+                response = _pipeline_response(request.claim, data)
+                if data.get("cacheable", True):
+                    execution_time = time.time() - start_time
+                    await _save_response(request.claim, response, execution_time)
+                yield _sse("result", response)
+
+        except HTTPException as e:
+            yield _sse("error", {"status": e.status_code, "detail": e.detail})
+        except RateLimitExceeded:
+            yield _sse("error", {"status": 503, "detail": _RATE_LIMITED_DETAIL})
+        except Exception:
+            logger.exception("Unhandled error in /verify/stream")
+            yield _sse(
+                "error",
+                {
+                    "status": 500,
+                    "detail": "Something went wrong. Please try again later.",
+                },
+            )
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@router.post("/verify/jobs", status_code=202, dependencies=[Depends(rate_limit)])
+async def submit_verify_job(request: VerifyClaimRequest):
+    """Queue a health claim for verification and return a job id at once.
+
+    The cache lookup and validation happen up front: a cached claim comes
+    back already ``done`` with status 200, and a vague claim gets a 400
+    (validator failures map to 503 or 500 as for ``/verify``). Otherwise
+    the response is a 202 with a job id; poll ``GET /verify/jobs/{job_id}``
+    for the result.
+    """
+    cached = await _cached_or_validated(request.claim, "/verify/jobs")
+    if cached is not None:
+        return ORJSONResponse(
+            {"job_id": None, "status": "done", "result": orjson.Fragment(cached)},
+            status_code=200,
+        )
+    return {"job_id": jobs.submit(request.claim), "status": "pending"}
+
+
+@router.get("/verify/jobs/{job_id}")
+async def get_verify_job(job_id: str):
+    """Poll a verification job.
+
+    Returns ``status`` pending, done (with ``result``, the same body as
+    ``/verify``) or error (with ``error``: {"status": ..., "detail": ...}).
+    Jobs are kept for an hour after they finish.
+    """
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    body = {"job_id": job_id, "status": job.status}
+    if job.result is not None:
+        body["result"] = orjson.Fragment(job.result)
+    if job.error is not None:
+        body["error"] = job.error
+    return ORJSONResponse(body)
+
+
 @router.get("/health")
 async def health_check():
     """Health check endpoint."""
@@ -0,0 +1,19 @@
+"""Process-wide HTTP client shared by the LLM agents and the PubMed tool.
+
+Building a fresh ChatGroq per request also builds a fresh connection pool,
+so every call pays a new TCP + TLS handshake. Passing this single client to
+every ChatGroq, and using it for NCBI E-utilities requests, keeps
+connections to both APIs warm across requests.
+"""
+
+import httpx
+
+http_client = httpx.AsyncClient(
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+    timeout=30,
+)
+
+
+async def close_http_client() -> None:
+    """Close the shared client. Called from the FastAPI lifespan on shutdown."""
+    await http_client.aclose()
@@ -1,5 +1,7 @@
 """Application configuration settings."""
 
+from functools import cached_property
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -17,6 +19,8 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = "sqlite+aiosqlite:///./data/verity.db"
+    db_pool_size: int = 20
+    db_max_overflow: int = 10
 
     # API Configuration
     cors_origins: str = "http://localhost:3000"
@@ -27,12 +31,39 @@ class Settings(BaseSettings):
     app_name: str = "Verity"
     debug: bool = False
 
+    # Maximum PubMed searches in flight at once. NCBI allows 3 requests/second
+    # without an API key (10 with one); each search is an esearch plus an efetch.
+    pubmed_max_concurrency: int = 3
+    ncbi_api_key: str | None = None
+
+    # Send every study to the LLM, even ones the heuristic scores confidently.
+    # Useful for A/B-checking heuristic scores against LLM scores.
+    force_llm_scoring: bool = False
+
+    # Verdict requests arriving within this window are synthesized in one LLM
+    # call (up to synthesis_max_batch claims). 0 (the default) disables
+    # batching. Enabling it weakens isolation between requests: unrelated
+    # users' claims share one prompt, so text injected in one claim could
+    # sway another's verdict despite the per-claim tags and prompt rules.
+    # Every lone request also waits out the window before it streams.
+    synthesis_batch_window_ms: int = 0
+    synthesis_max_batch: int = 8
+
+    # Claims verified concurrently for background jobs (/verify/jobs)
+    verify_job_workers: int = 4
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
         case_sensitive=False,
+        frozen=True,
     )
 
+    @cached_property
+    def cors_origins_list(self) -> tuple[str, ...]:
+        """Allowed CORS origins, split from the comma-separated setting."""
+        return tuple(self.cors_origins.split(","))
+
 
 # Global settings instance
 settings = Settings()
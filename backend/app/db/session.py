@@ -1,15 +1,52 @@
 """Database session management."""
 
+import orjson
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from app.config import settings
 
-# Create async engine
+# Create async engine. The pool is sized for concurrent /verify requests;
+# SQLite connections are local files, so they skip the liveness ping and
+# recycling meant for networked databases and instead wait on its write lock.
+if settings.database_url.startswith("sqlite"):
+    _engine_options = {"connect_args": {"timeout": 30}}
+else:
+    _engine_options = {"pool_pre_ping": True, "pool_recycle": 1800}
+
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,  # Log SQL queries in debug mode
     future=True,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=30,
+    # JSON columns (cached studies, stats) are encoded and decoded with orjson
+    json_serializer=lambda value: orjson.dumps(value).decode(),
+    json_deserializer=orjson.loads,
+    **_engine_options,
+)
+
+# SQLite tuning, applied to every new connection: WAL lets readers proceed
+# during a cache write, and synchronous=NORMAL drops the per-commit fsync
+# (still crash-safe in WAL mode; only the last commits can be lost)
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",  # 256 MB
+    "PRAGMA cache_size=-65536",  # 64 MB
 )
 
+if settings.database_url.startswith("sqlite"):
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.close()
+
+
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -23,6 +60,10 @@ AsyncSessionLocal = async_sessionmaker(
 async def get_db() -> AsyncSession:
     """Dependency for getting database sessions in FastAPI.
 
+    The session is not committed for you: commit explicitly after writes.
+    Endpoints that do slow work between queries should open short-lived
+    AsyncSessionLocal() sessions instead, so no connection is held idle.
+
     Usage in endpoints:
         @app.get("/endpoint")
         async def my_endpoint(db: AsyncSession = Depends(get_db)):
@@ -30,11 +71,4 @@ async def get_db() -> AsyncSession:
             result = await db.execute(select(Model))
     """
     async with AsyncSessionLocal() as session:
-        try:
-            yield session
-            await session.commit()
-        except Exception:
-            await session.rollback()
-            raise
-        finally:
-            await session.close()
+        yield session
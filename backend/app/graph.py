@@ -4,6 +4,7 @@ This module defines the StateGraph that orchestrates the 3-agent pipeline:
 Search Agent → Quality Evaluator → Synthesis Agent
 """
 
+from collections.abc import AsyncIterator
 from langgraph.graph import StateGraph, END
 from app.models.state import VerityState
 from app.agents.search_agent import search_node
@@ -42,3 +43,21 @@ async def run_verity(claim: str) -> VerityState:
     initial_state: VerityState = {"claim": claim}
     final_state = await verity_graph.ainvoke(initial_state)
     return final_state
+
+
+async def stream_verity(claim: str) -> AsyncIterator[tuple[str, dict]]:
+    """Run the Verity pipeline, streaming verdict fields as they are generated.
+
+    Yields:
+        ("field", {"field": name, "value": value}) for each verdict field the
+        Synthesis Agent completes, then ("result", final_state) once.
+    """
+    final_state: VerityState = {"claim": claim}
+    async for mode, chunk in verity_graph.astream(
+        {"claim": claim}, stream_mode=["custom", "values"]
+    ):
+        if mode == "custom":
+            yield "field", chunk
+        else:
+            final_state = chunk
+    yield "result", final_state
@@ -1,8 +1,10 @@
 """FastAPI application entry point."""
 
 import logging
+import queue
 import sys
 from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -12,27 +14,40 @@ load_dotenv(override=True)
 
 from fastapi import FastAPI  # noqa: E402
 from fastapi.middleware.cors import CORSMiddleware  # noqa: E402
-from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+from fastapi.responses import ORJSONResponse  # noqa: E402
 
+from app.clients import close_http_client  # noqa: E402
 from app.config import settings  # noqa: E402
+from app.db.session import engine  # noqa: E402
 from app.api import verity  # noqa: E402
-from app.models.database import Base  # noqa: E402
+from app.models.database import Base, upgrade_cached_results  # noqa: E402
 
 
-def setup_logging():
+def setup_logging() -> QueueListener:
     log_level = logging.DEBUG if settings.debug else logging.INFO
-    logging.basicConfig(
-        level=log_level,
-        format="%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-        handlers=[logging.StreamHandler(sys.stdout)],
+
+    # Records are queued by the caller and written to stdout by a background
+    # thread, so log I/O never blocks the event loop
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(
+        logging.Formatter(
+            "%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
+            datefmt="%Y-%m-%d %H:%M:%S",
+        )
     )
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, stream_handler)
+
+    logging.basicConfig(level=log_level, handlers=[QueueHandler(log_queue)])
     # Silence noisy third-party libraries
     for lib in ["httpx", "httpcore", "urllib3", "sqlalchemy.engine"]:
         logging.getLogger(lib).setLevel(logging.WARNING)
 
+    listener.start()
+    return listener
+
 
-setup_logging()
+log_listener = setup_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -41,14 +56,20 @@ async def lifespan(app: FastAPI):
     logger.info("Starting Verity API...")
     Path("data").mkdir(exist_ok=True)
 
-    engine = create_async_engine(settings.database_url)
+    # Uses the app's engine, so schema setup runs with the same connection
+    # settings (e.g. SQLite PRAGMAs) as requests
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
-    await engine.dispose()
+        await conn.run_sync(upgrade_cached_results)
 
+    verity.jobs.start()
     logger.info("Verity API ready")
     yield
     logger.info("Shutting down Verity API...")
+    await verity.jobs.stop()
+    await engine.dispose()
+    await close_http_client()
+    log_listener.stop()
 
 
 app = FastAPI(
@@ -58,11 +79,12 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.cors_origins.split(","),
+    allow_origins=settings.cors_origins_list,
     allow_credentials=True,
     allow_methods=["GET", "POST"],
     allow_headers=["Content-Type"],
@@ -1,12 +1,61 @@
 """SQLAlchemy database models for caching and tracking."""
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, JSON, Text
+import zlib
+
+import orjson
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    Float,
+    DateTime,
+    Index,
+    JSON,
+    LargeBinary,
+    Text,
+    TypeDecorator,
+    inspect,
+    text,
+)
 from sqlalchemy.ext.declarative import declarative_base
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
+
+from app.utils.normalize import hash_claim
 
 Base = declarative_base()
 
 
+class PackedJSON(TypeDecorator):
+    """JSON value stored as zlib-compressed orjson bytes.
+
+    Values written before this type was used are JSON text; SQLite hands
+    those back as str, and they are still decoded.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return zlib.compress(orjson.dumps(value), 6)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, str):
+            return orjson.loads(value)
+        return orjson.loads(zlib.decompress(value))
+
+
+def as_utc(value: datetime) -> datetime:
+    """Re-attach UTC to a datetime read back from SQLite, which strips tzinfo.
+
+    Aware values (e.g. from PostgreSQL) are returned unchanged.
+    """
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
 class CachedResult(Base):
     """Cached verification results for health claims.
 
@@ -15,16 +64,28 @@ class CachedResult(Base):
     """
 
     __tablename__ = "cached_results"
+    # Lookups filter on expiry too, so expired entries are rejected from the
+    # index without reading the row
+    __table_args__ = (
+        Index(
+            "ix_cached_results_hash_expires",
+            "normalized_claim_hash",
+            "cache_expires_at",
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    normalized_claim = Column(String(500), unique=True, index=True, nullable=False)
+    # Lookups go through the fixed-width hash; the text is kept for debugging
+    normalized_claim_hash = Column(LargeBinary(32), unique=True, index=True)
+    normalized_claim = Column(String(500), nullable=False)
     original_claim = Column(String(500), nullable=False)
 
     # Result data
     verdict = Column(String(50), nullable=False)  # "works", "maybe", "doesnt_work"
     verdict_emoji = Column(String(10), nullable=False)
     summary = Column(Text, nullable=False)  # Full formatted markdown output
-    studies_json = Column(JSON, nullable=False)  # List of top studies used
+    studies_json = Column(PackedJSON, nullable=False)  # List of top studies used
+    response_json = Column(LargeBinary)  # Encoded response body, served as-is
 
     # Metadata
     stats = Column(
@@ -53,44 +114,78 @@ class CachedResult(Base):
     def __repr__(self):
         return f"<CachedResult(claim='{self.normalized_claim}', verdict='{self.verdict}', v{self.version})>"
 
-    @classmethod
-    def create_with_ttl(cls, days: int = 30, **kwargs):
-        """Create a cached result with TTL in days."""
-        expires_at = datetime.now(timezone.utc) + timedelta(days=days)
-        return cls(cache_expires_at=expires_at, **kwargs)
-
     def is_expired(self) -> bool:
         """Check if this cache entry has expired."""
-        # SQLite strips timezone info on read — re-attach UTC before comparing
-        expires_at = (
-            self.cache_expires_at.replace(tzinfo=timezone.utc)
-            if self.cache_expires_at.tzinfo is None
-            else self.cache_expires_at
+        return datetime.now(timezone.utc) > as_utc(self.cache_expires_at)
+
+
+class CachedScore(Base):
+    """LLM quality score for a single study, keyed by a metadata fingerprint.
+
+    Study metadata doesn't change, and PubMed often returns the same studies
+    for different claims, so a score can be reused across requests. The
+    fingerprint also covers the scoring version, so a rubric change takes
+    effect at once; entries expire after 30 days.
+    """
+
+    __tablename__ = "cached_scores"
+
+    id = Column(Integer, primary_key=True, index=True)
+    fingerprint = Column(String(64), unique=True, index=True, nullable=False)
+
+    quality_score = Column(Float, nullable=False)
+    quality_rationale = Column(Text, nullable=False)
+
+    created_at = Column(
+        DateTime, default=lambda: datetime.now(timezone.utc), nullable=False
+    )
+    cache_expires_at = Column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<CachedScore(fingerprint='{self.fingerprint[:12]}', score={self.quality_score})>"
+
+    def is_expired(self) -> bool:
+        """Check if this cached score has expired."""
+        return datetime.now(timezone.utc) > as_utc(self.cache_expires_at)
+
+
+def upgrade_cached_results(connection) -> None:
+    """Add columns and indexes that older cached_results tables lack.
+
+    create_all only creates missing tables, so existing cached_results tables
+    are upgraded here. Run with a sync connection (AsyncConnection.run_sync).
+    """
+    table = CachedResult.__tablename__
+    columns = {column["name"] for column in inspect(connection).get_columns(table)}
+
+    if "response_json" not in columns:
+        # Older rows keep NULL and are rebuilt from their columns on a hit
+        column_type = CachedResult.response_json.type.compile(connection.dialect)
+        connection.execute(
+            text(f"ALTER TABLE {table} ADD COLUMN response_json {column_type}")
         )
-        return datetime.now(timezone.utc) > expires_at
-
-    def update_with_fresh_data(
-        self,
-        verdict: str,
-        verdict_emoji: str,
-        summary: str,
-        studies_json: dict,
-        stats: dict,
-        execution_time: float,
-        ttl_days: int = 30,
-    ):
-        """Update expired cache entry with fresh analysis data.
-
-        This preserves the original created_at timestamp and increments
-        the version counter, allowing us to track how the evidence has
-        changed over time.
-        """
-        self.verdict = verdict
-        self.verdict_emoji = verdict_emoji
-        self.summary = summary
-        self.studies_json = studies_json
-        self.stats = stats
-        self.execution_time = execution_time
-        self.last_updated = datetime.now(timezone.utc)
-        self.cache_expires_at = datetime.now(timezone.utc) + timedelta(days=ttl_days)
-        self.version += 1
+
+    if "normalized_claim_hash" not in columns:
+        column_type = CachedResult.normalized_claim_hash.type.compile(
+            connection.dialect
+        )
+        connection.execute(
+            text(f"ALTER TABLE {table} ADD COLUMN normalized_claim_hash {column_type}")
+        )
+        rows = connection.execute(text(f"SELECT id, normalized_claim FROM {table}"))
+        for row_id, normalized in rows.all():
+            connection.execute(
+                text(
+                    f"UPDATE {table} SET normalized_claim_hash = :hash WHERE id = :id"
+                ),
+                {"hash": hash_claim(normalized), "id": row_id},
+            )
+        connection.execute(
+            text(
+                f"CREATE UNIQUE INDEX ix_{table}_normalized_claim_hash "
+                f"ON {table} (normalized_claim_hash)"
+            )
+        )
+
+    for index in CachedResult.__table__.indexes:
+        index.create(connection, checkfirst=True)
@@ -1,12 +1,16 @@
 """LangGraph state schema - data passed between agents in the pipeline."""
 
-from typing import TypedDict, Annotated, List, Optional
+from typing import TypedDict, Annotated, List, NotRequired, Optional
 from operator import add
-from pydantic import BaseModel
 
 
-class Study(BaseModel):
-    """Metadata for a scientific study from PubMed."""
+class Study(TypedDict):
+    """Metadata for a scientific study from PubMed.
+
+    A plain dict at runtime: studies are built once per parsed record and
+    passed through the pipeline without per-field validation. The Quality
+    Evaluator adds the score fields.
+    """
 
     pubmed_id: str
     title: str
@@ -16,9 +20,9 @@ class Study(BaseModel):
     study_type: str
     sample_size: int
     url: str
-    abstract: Optional[str] = None
-    quality_score: Optional[float] = None
-    quality_rationale: Optional[str] = None
+    abstract: NotRequired[Optional[str]]
+    quality_score: NotRequired[Optional[float]]
+    quality_rationale: NotRequired[Optional[str]]
 
 
 class VerityState(TypedDict, total=False):
@@ -36,8 +40,10 @@ class VerityState(TypedDict, total=False):
     # Quality Evaluator outputs
     scored_studies: List[Study]
     top_studies: List[Study]
+    studies_context: str  # Synthesis prompt block for top_studies, built once
 
     # Synthesis Agent outputs
     verdict: str
     verdict_emoji: str
     summary: str
+    cacheable: bool  # False for a placeholder verdict that must not be cached
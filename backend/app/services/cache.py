@@ -1,44 +1,101 @@
 """Cache service for storing and retrieving verification results."""
 
 import logging
-from datetime import datetime, timezone
-from sqlalchemy import select
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import bindparam, select
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
 
-from app.models.database import CachedResult
-from app.utils.normalize import normalize_claim
+from app.models.database import CachedResult, as_utc
+from app.utils.normalize import hash_claim, normalize_claim
 
 logger = logging.getLogger(__name__)
 
+# In-process tier in front of SQLite: encoded response bodies for hot claims,
+# keyed by normalized claim, served without a database round trip
+_HOT_TTL_SECONDS = 60
+_HOT_MAX_ENTRIES = 1024
+_hot_responses: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+
+# last_accessed is only rewritten when older than this, so most cache hits
+# are a single SELECT with no commit
+_TOUCH_INTERVAL = timedelta(hours=1)
+
+# Columns a hit only needs for entries saved without response_json; they
+# hold the largest values (the compressed studies list), so they are left
+# out of the lookup and loaded only for those older entries
+_LEGACY_BODY_COLUMNS = ("summary", "studies_json", "stats")
+
+# Built once with bound parameters, so each lookup reuses the same statement
+# (and its compiled form) instead of constructing a new one; expired entries
+# are filtered out in SQL, so they are never loaded
+_SELECT_FRESH = (
+    select(CachedResult)
+    .where(
+        CachedResult.normalized_claim_hash == bindparam("claim_hash"),
+        CachedResult.cache_expires_at > bindparam("now"),
+    )
+    .options(*(defer(getattr(CachedResult, name)) for name in _LEGACY_BODY_COLUMNS))
+)
+
+# INSERT constructs with ON CONFLICT DO UPDATE, so a save is one statement
+_UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+def get_hot_response(claim: str) -> bytes | None:
+    """Return the in-process cached response body for a claim, if fresh."""
+    key = normalize_claim(claim)
+    entry = _hot_responses.get(key)
+    if entry is None:
+        return None
+    expires_at, response = entry
+    if expires_at <= time.monotonic():
+        del _hot_responses[key]
+        return None
+    _hot_responses.move_to_end(key)
+    return response
+
+
+def put_hot_response(claim: str, response: bytes) -> None:
+    """Keep a response body in the in-process tier, evicting the LRU entry."""
+    key = normalize_claim(claim)
+    _hot_responses[key] = (time.monotonic() + _HOT_TTL_SECONDS, response)
+    _hot_responses.move_to_end(key)
+    if len(_hot_responses) > _HOT_MAX_ENTRIES:
+        _hot_responses.popitem(last=False)
+
 
 async def get_cached_result(db: AsyncSession, claim: str) -> CachedResult | None:
     """Look up a cached result for a claim.
 
     Returns the cached result if found and not expired, None otherwise.
-    Updates last_accessed timestamp on cache hit.
+    Only entries without a stored response_json have their summary,
+    studies and stats loaded. Refreshes the last_accessed timestamp on a
+    hit when it is stale.
     """
-    normalized = normalize_claim(claim)
+    claim_hash = hash_claim(normalize_claim(claim))
     logger.debug("Cache lookup for normalized claim")
 
-    result = await db.execute(
-        select(CachedResult).where(CachedResult.normalized_claim == normalized)
-    )
+    now = datetime.now(timezone.utc)
+    result = await db.execute(_SELECT_FRESH, {"claim_hash": claim_hash, "now": now})
     cached = result.scalar_one_or_none()
 
     if cached is None:
-        logger.debug("Cache MISS - no entry found")
+        logger.debug("Cache MISS - no fresh entry found")
         return None
 
-    # Check if expired
-    if cached.is_expired():
-        logger.debug("Cache MISS - entry expired")
-        return None
+    if cached.response_json is None:
+        await db.refresh(cached, list(_LEGACY_BODY_COLUMNS))
 
-    # Update last_accessed timestamp
-    cached.last_accessed = datetime.now(timezone.utc)
-    await db.commit()
+    # Update last_accessed timestamp when stale
+    if now - as_utc(cached.last_accessed) > _TOUCH_INTERVAL:
+        cached.last_accessed = now
+        await db.commit()
 
-    logger.info(f"Cache HIT (v{cached.version})")
+    logger.info("Cache HIT (v%d)", cached.version)
     return cached
 
 
@@ -53,51 +110,50 @@ async def save_to_cache(
     stats: dict,
     execution_time: float = 0.0,
     ttl_days: int = 30,
+    response_json: bytes | None = None,
 ) -> CachedResult:
     """Save a verification result to the cache.
 
-    If a cache entry exists for this claim (even if expired), update it.
-    Otherwise, create a new entry.
+    Inserts a new entry, or updates the existing one for this claim (even
+    if expired) in the same statement. An updated entry keeps its original
+    created_at and gets its version incremented, tracking how the evidence
+    has changed over time. response_json is the encoded response body,
+    returned as-is on later hits.
     """
     normalized = normalize_claim(claim)
+    now = datetime.now(timezone.utc)
     logger.debug("Saving to cache")
 
-    # Check if entry already exists
-    result = await db.execute(
-        select(CachedResult).where(CachedResult.normalized_claim == normalized)
+    fresh = {
+        "verdict": verdict,
+        "verdict_emoji": verdict_emoji,
+        "summary": summary,
+        "studies_json": top_studies,
+        "stats": stats,
+        "execution_time": execution_time,
+        "response_json": response_json,
+        "last_accessed": now,
+        "last_updated": now,
+        "cache_expires_at": now + timedelta(days=ttl_days),
+    }
+
+    insert = _UPSERT_INSERTS[db.get_bind().dialect.name]
+    stmt = insert(CachedResult).values(
+        normalized_claim_hash=hash_claim(normalized),
+        normalized_claim=normalized,
+        original_claim=claim,
+        **fresh,
     )
-    cached = result.scalar_one_or_none()
-
-    if cached is not None:
-        # Update existing entry
-        logger.debug(f"Updating existing cache entry (v{cached.version})")
-        cached.update_with_fresh_data(
-            verdict=verdict,
-            verdict_emoji=verdict_emoji,
-            summary=summary,
-            studies_json=top_studies,
-            stats=stats,
-            execution_time=execution_time,
-            ttl_days=ttl_days,
-        )
-    else:
-        # Create new entry
-        logger.debug("Creating new cache entry")
-        cached = CachedResult.create_with_ttl(
-            days=ttl_days,
-            normalized_claim=normalized,
-            original_claim=claim,
-            verdict=verdict,
-            verdict_emoji=verdict_emoji,
-            summary=summary,
-            studies_json=top_studies,
-            stats=stats,
-            execution_time=execution_time,
-        )
-        db.add(cached)
-
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[CachedResult.normalized_claim_hash],
+        set_={
+            **{key: stmt.excluded[key] for key in fresh},
+            "version": CachedResult.version + 1,
+        },
+    ).returning(CachedResult)
+
+    cached = (await db.scalars(stmt)).one()
     await db.commit()
-    await db.refresh(cached)
-    logger.info(f"Cache saved (v{cached.version})")
+    logger.info("Cache saved (v%d)", cached.version)
 
     return cached
@@ -1,9 +1,15 @@
 """Claim validation service - ensures claims are specific and testable."""
 
 import logging
+from collections import OrderedDict
+
 from langchain_groq import ChatGroq
 from langchain_core.messages import HumanMessage, SystemMessage
+from app.clients import http_client
 from app.config import settings
+from app.services.singleflight import SingleFlight
+from app.utils.json_stream import extract_json_object
+from app.utils.normalize import normalize_claim
 from app.utils.retry import invoke_with_retry
 from app.utils.sanitize import (
     sanitize_claim,
@@ -11,10 +17,54 @@ from app.utils.sanitize import (
     get_security_instruction,
     is_claim_suspicious,
 )
-import json
 
 logger = logging.getLogger(__name__)
 
+_SYSTEM_PROMPT = """You are a health claim validator. Determine if a claim is SPECIFIC enough to search for scientific evidence.
+
+A VALID claim must have:
+1. A specific INTERVENTION (supplement, treatment, activity, food, etc.)
+2. A specific OUTCOME (what effect or condition is being measured)
+
+VALID examples:
+- "Does creatine improve muscle strength?" (intervention: creatine, outcome: muscle strength)
+- "Can vitamin D reduce depression symptoms?" (intervention: vitamin D, outcome: depression)
+- "Does intermittent fasting help with weight loss?" (intervention: intermittent fasting, outcome: weight loss)
+
+INVALID examples (too vague):
+- "red light therapy" (no outcome specified)
+- "is turmeric good for you" (outcome too vague)
+- "benefits of exercise" (outcome too vague)
+- "creatine" (no outcome specified)
+
+Respond with JSON only:
+{
+  "valid": true/false,
+  "reason": "brief explanation",
+  "suggestions": ["specific claim 1", "specific claim 2", "specific claim 3"]
+}
+
+If valid, suggestions can be empty. If invalid, provide 2-3 specific claim suggestions based on common research questions about the topic.
+""" + get_security_instruction()
+
+_SYSTEM_MESSAGE = SystemMessage(content=_SYSTEM_PROMPT)
+
+# Created on first use and shared by every validation request
+_llm: ChatGroq | None = None
+
+
+def _get_llm() -> ChatGroq:
+    """Return the process-wide validator LLM, creating it on first use."""
+    global _llm
+    if _llm is None:
+        _llm = ChatGroq(
+            model="llama-3.3-70b-versatile",
+            api_key=settings.groq_api_key,
+            http_async_client=http_client,
+            temperature=0,
+        )
+    return _llm
+
 
 class ClaimValidationError(Exception):
     """Raised when a claim is too vague or not testable."""
@@ -25,6 +75,16 @@ class ClaimValidationError(Exception):
         super().__init__(self.message)
 
 
+# Recent LLM validation results keyed by normalized claim, so a resubmitted
+# claim (including a rejected vague one) skips the LLM call
+_CACHE_SIZE = 1024
+_results: OrderedDict[str, dict] = OrderedDict()
+
+# Validations in flight, keyed by normalized claim, so concurrent requests
+# for the same new claim share one LLM call
+_inflight = SingleFlight()
+
+
 async def validate_claim(claim: str) -> dict:
     """Validate that a health claim is specific and testable.
 
@@ -41,66 +101,42 @@ async def validate_claim(claim: str) -> dict:
     Raises:
         ClaimValidationError: If the claim is too vague
     """
-    # Security: Check and sanitize input
-    if is_claim_suspicious(claim):
-        logger.warning("Suspicious claim detected (possible injection attempt)")
-
-    sanitized_claim = sanitize_claim(claim)
-
-    llm = ChatGroq(
-        model="llama-3.3-70b-versatile", api_key=settings.groq_api_key, temperature=0
-    )
+    key = normalize_claim(claim)
+    result = _results.get(key)
+    if result is not None:
+        _results.move_to_end(key)
+    else:
+        result = await _inflight.do(key, lambda: _validate_with_llm(claim))
+        _results[key] = result
+        if len(_results) > _CACHE_SIZE:
+            _results.popitem(last=False)
 
-    system_prompt = """You are a health claim validator. Determine if a claim is SPECIFIC enough to search for scientific evidence.
-
-A VALID claim must have:
-1. A specific INTERVENTION (supplement, treatment, activity, food, etc.)
-2. A specific OUTCOME (what effect or condition is being measured)
+    if not result.get("valid", False):
+        raise ClaimValidationError(
+            message=result.get("reason", "Claim is too vague"),
+            suggestions=result.get("suggestions", []),
+        )
 
-VALID examples:
-- "Does creatine improve muscle strength?" (intervention: creatine, outcome: muscle strength)
-- "Can vitamin D reduce depression symptoms?" (intervention: vitamin D, outcome: depression)
-- "Does intermittent fasting help with weight loss?" (intervention: intermittent fasting, outcome: weight loss)
+    return result
 
-INVALID examples (too vague):
-- "red light therapy" (no outcome specified)
-- "is turmeric good for you" (outcome too vague)
-- "benefits of exercise" (outcome too vague)
-- "creatine" (no outcome specified)
 
-Respond with JSON only:
-{
-  "valid": true/false,
-  "reason": "brief explanation",
-  "suggestions": ["specific claim 1", "specific claim 2", "specific claim 3"]
-}
+async def _validate_with_llm(claim: str) -> dict:
+    """Ask the LLM whether a claim is specific enough, returning its JSON."""
+    # Security: Check and sanitize input
+    if is_claim_suspicious(claim):
+        logger.warning("Suspicious claim detected (possible injection attempt)")
 
-If valid, suggestions can be empty. If invalid, provide 2-3 specific claim suggestions based on common research questions about the topic.
-""" + get_security_instruction()
+    sanitized_claim = sanitize_claim(claim)
 
     # Wrap user content in tags for clear boundary
     wrapped_claim = wrap_user_content(sanitized_claim)
 
     messages = [
-        SystemMessage(content=system_prompt),
+        _SYSTEM_MESSAGE,
         HumanMessage(content=f"Analyze this health claim:\n{wrapped_claim}"),
     ]
 
-    response = await invoke_with_retry(llm, messages)
-
-    # Parse response
-    content = response.content
-    if "```json" in content:
-        content = content.split("```json")[1].split("```")[0].strip()
-    elif "```" in content:
-        content = content.split("```")[1].split("```")[0].strip()
-
-    result = json.loads(content)
-
-    if not result.get("valid", False):
-        raise ClaimValidationError(
-            message=result.get("reason", "Claim is too vague"),
-            suggestions=result.get("suggestions", []),
-        )
+    response = await invoke_with_retry(_get_llm(), messages)
 
-    return result
+    # Parse the JSON object, skipping any markdown code fence
+    return extract_json_object(response.content)
@@ -0,0 +1,113 @@
+"""Background verification jobs.
+
+A verification takes tens of seconds of PubMed and LLM round trips. Job
+submission returns at once with a job id; a fixed pool of worker tasks
+runs the queued claims and clients poll for the result. Jobs live in
+memory and are forgotten an hour after they finish.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+
+class JobFailed(Exception):
+    """Raised by a job handler to fail a job with a client-facing error."""
+
+    def __init__(self, detail: dict):
+        super().__init__(detail)
+        self.detail = detail
+
+
+@dataclass
+class Job:
+    """State of one queued claim verification."""
+
+    claim: str
+    status: str = "pending"  # pending | done | error
+    result: bytes | None = None  # Encoded response body once done
+    error: dict | None = None  # {"status": ..., "detail": ...} on failure
+    finished_at: float | None = None
+
+
+class JobQueue:
+    """Queue of claims verified by a fixed pool of worker tasks.
+
+    Args:
+        handler: Coroutine verifying a claim and returning the encoded
+            response body. Raise JobFailed for errors the client should see.
+        workers: Number of claims verified concurrently
+        ttl_seconds: How long finished jobs stay available for polling
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[str], Awaitable[bytes]],
+        workers: int = 4,
+        ttl_seconds: float = 3600,
+    ):
+        self.handler = handler
+        self.workers = workers
+        self.ttl_seconds = ttl_seconds
+        self._jobs: dict[str, Job] = {}
+        self._queue: asyncio.Queue[str] = asyncio.Queue()
+        self._tasks: list[asyncio.Task] = []
+
+    def start(self) -> None:
+        """Start the worker tasks (call from the app lifespan)."""
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Cancel the worker tasks; jobs still running are abandoned."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, claim: str) -> str:
+        """Queue a claim for verification and return its job id."""
+        self._prune()
+        job_id = uuid.uuid4().hex
+        self._jobs[job_id] = Job(claim)
+        self._queue.put_nowait(job_id)
+        return job_id
+
+    def get(self, job_id: str) -> Job | None:
+        """Return a job by id, or None if unknown or expired."""
+        return self._jobs.get(job_id)
+
+    def _prune(self) -> None:
+        """Forget finished jobs older than the TTL."""
+        cutoff = time.monotonic() - self.ttl_seconds
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    async def _work(self) -> None:
+        """Run queued jobs one at a time until cancelled."""
+        while True:
+            job_id = await self._queue.get()
+            job = self._jobs.get(job_id)
+            if job is None:
+                continue
+            try:
+                job.result = await self.handler(job.claim)
+                job.status = "done"
+            except JobFailed as e:
+                job.error = e.detail
+                job.status = "error"
+            except Exception:
+                logger.exception("Verification job %s failed", job_id)
+                job.error = {"status": 500, "detail": "Verification failed."}
+                job.status = "error"
+            finally:
+                job.finished_at = time.monotonic()
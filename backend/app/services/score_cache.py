@@ -0,0 +1,105 @@
+"""Persistent cache of LLM quality scores keyed by study metadata."""
+
+import hashlib
+import logging
+from datetime import datetime, timedelta, timezone
+import orjson
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.database import CachedScore
+from app.models.state import Study
+
+logger = logging.getLogger(__name__)
+
+# Metadata the LLM sees when scoring; identical values mean an identical score
+_FINGERPRINT_FIELDS = (
+    "title",
+    "authors",
+    "year",
+    "journal",
+    "study_type",
+    "sample_size",
+)
+
+# INSERT constructs with ON CONFLICT DO UPDATE, so concurrent saves of the
+# same study's score don't collide on the unique fingerprint
+_UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+def study_fingerprint(study: Study, scoring_version: str) -> str:
+    """Hash the scoring-relevant metadata of a study into a cache key.
+
+    scoring_version identifies the rubric and models that produce the score,
+    so scores from an older rubric are never looked up again.
+    """
+    fields = {field: study.get(field) for field in _FINGERPRINT_FIELDS}
+    fields["scoring_version"] = scoring_version
+    payload = orjson.dumps(fields, option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(payload, digest_size=32).hexdigest()
+
+
+async def get_cached_scores(db: AsyncSession, fingerprints: list[str]) -> dict:
+    """Look up unexpired cached scores for a batch of study fingerprints.
+
+    Returns:
+        Mapping of fingerprint to {"quality_score", "quality_rationale"}
+        for every cache hit. Misses are simply absent.
+    """
+    if not fingerprints:
+        return {}
+
+    result = await db.execute(
+        select(CachedScore).where(CachedScore.fingerprint.in_(set(fingerprints)))
+    )
+
+    hits = {}
+    for cached in result.scalars():
+        if cached.is_expired():
+            continue
+        hits[cached.fingerprint] = {
+            "quality_score": cached.quality_score,
+            "quality_rationale": cached.quality_rationale,
+        }
+
+    logger.debug("Score cache: %d/%d hits", len(hits), len(fingerprints))
+    return hits
+
+
+async def save_scores(db: AsyncSession, scores: dict, ttl_days: int = 30) -> None:
+    """Save freshly computed scores, refreshing any existing (expired) entries.
+
+    Args:
+        db: Database session
+        scores: Mapping of fingerprint to {"quality_score", "quality_rationale"}
+        ttl_days: Days until the cached scores expire
+    """
+    if not scores:
+        return
+
+    expires_at = datetime.now(timezone.utc) + timedelta(days=ttl_days)
+
+    insert = _UPSERT_INSERTS[db.get_bind().dialect.name]
+    stmt = insert(CachedScore).values(
+        [
+            {
+                "fingerprint": fingerprint,
+                "quality_score": score["quality_score"],
+                "quality_rationale": score["quality_rationale"],
+                "cache_expires_at": expires_at,
+            }
+            for fingerprint, score in scores.items()
+        ]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[CachedScore.fingerprint],
+        set_={
+            key: stmt.excluded[key]
+            for key in ("quality_score", "quality_rationale", "cache_expires_at")
+        },
+    )
+
+    await db.execute(stmt)
+    await db.commit()
+    logger.debug("Score cache: saved %d scores", len(scores))
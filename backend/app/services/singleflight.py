@@ -0,0 +1,37 @@
+"""Coalescing of duplicate in-flight work.
+
+When several requests need the same expensive result at once (e.g. the
+same claim submitted by many users while the cache is cold), only the
+first runs the work; the rest await the same task and share its result
+or exception.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Run at most one call per key at a time, sharing its outcome.
+
+    The work runs in its own task, so a caller that disconnects or is
+    cancelled does not cancel it for the others still waiting.
+
+    Example:
+        flight = SingleFlight()
+        body = await flight.do(claim_key, lambda: run_pipeline(claim))
+    """
+
+    def __init__(self):
+        self._calls: dict[str, asyncio.Task] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Return fn()'s result, joining an in-flight call for key if any."""
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        return await asyncio.shield(task)
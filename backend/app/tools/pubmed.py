@@ -5,39 +5,121 @@ Requires email address for NCBI rate limiting compliance.
 """
 
 import asyncio
+import io
 import re
+import xml.etree.ElementTree as ET
 from typing import List, Dict, Any
 from datetime import datetime
 from Bio import Entrez
+from app.clients import http_client
 from app.config import settings
 from app.models.state import Study
 
+_EUTILS_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
+
+# Structured abstract sections kept for synthesis
+_FINDINGS_LABELS = {"RESULTS", "CONCLUSIONS", "CONCLUSION", "FINDINGS"}
+
+# Abstract characters kept on a Study once it is classified. Synthesis reads
+# at most the first 500 characters and 100 tokens of an abstract, so this
+# bounds what every state copy carries without losing anything it uses.
+_MAX_ABSTRACT_CHARS = 2000
+
+# IDs sent in one efetch request; NCBI accepts up to 200 per GET
+_MAX_FETCH_IDS = 200
+
+# Study type patterns in one alternation, matched against the lowercased
+# title and abstract so the text is scanned once
+_STUDY_TYPE_RE = re.compile(
+    r"(?P<meta>meta-analysis|meta analysis|systematic review)"
+    r"|(?P<rct>randomized controlled trial|randomized control trial|rct|randomised)"
+    r"|(?P<cohort>cohort study|prospective study|longitudinal)"
+    r"|(?P<case_control>case-control|case control)"
+    r"|(?P<review>review|literature review)"
+)
+
+# Study type for each pattern group, highest quality first; the first type
+# found anywhere in the text wins
+_STUDY_TYPES = {
+    "meta": "meta-analysis",
+    "rct": "rct",
+    "cohort": "cohort study",
+    "case_control": "case-control",
+    "review": "review",
+}
+
+# Sample size patterns like "n=150", "N = 200", "n=1,500" or "40 patients"
+# in one alternation, matched against the lowercased abstract
+_SAMPLE_SIZE_RE = re.compile(
+    r"n\s*=\s*(?P<n>\d+,?\d*)"
+    r"|(?P<participants>\d+,?\d*)\s+participants"
+    r"|(?P<subjects>\d+,?\d*)\s+subjects"
+    r"|(?P<patients>\d+,?\d*)\s+patients"
+)
+
+# Sample size pattern groups, most explicit first; the first number found
+# for the highest group present wins
+_SAMPLE_SIZE_GROUPS = ("n", "participants", "subjects", "patients")
+
+
+def _element_text(element: ET.Element | None) -> str:
+    """Return an element's text including inline markup like <i>, or ""."""
+    return "".join(element.itertext()) if element is not None else ""
+
 
 class PubMedTool:
     """Wrapper for PubMed E-utilities API.
 
     Handles searching, fetching, and parsing study metadata from PubMed.
-    Implements rate limiting to comply with NCBI guidelines (3 requests/second).
+    Implements rate limiting to comply with NCBI guidelines (3 requests/second,
+    or 10 with an API key).
     """
 
     def __init__(self):
-        """Initialize PubMed tool with user email."""
-        # NCBI requires email for identification
-        Entrez.email = settings.pubmed_email
+        """Initialize PubMed tool with user email and optional API key."""
+        # NCBI requires a tool name and email for identification
+        self.identity = {"tool": "verity", "email": settings.pubmed_email}
+        if settings.ncbi_api_key:
+            self.identity["api_key"] = settings.ncbi_api_key
 
-        # Rate limiting: NCBI allows 3 requests/second without API key
-        self.rate_limit_delay = 0.34  # ~3 requests per second
-        self.last_request_time = 0.0
+        # Token bucket: up to `rate` requests at once, refilled at `rate`/second
+        self.rate = 10.0 if settings.ncbi_api_key else 3.0
+        self._tokens = self.rate
+        self._refilled_at = 0.0
 
     async def _rate_limit(self):
-        """Enforce rate limiting between requests."""
-        current_time = asyncio.get_event_loop().time()
-        time_since_last = current_time - self.last_request_time
+        """Take a request token, waiting for the bucket to refill if empty.
+
+        The token is taken straight away, leaving the bucket in debt when it
+        is empty, and the caller then sleeps until that debt is repaid.
+        Nothing is awaited between reading and updating the bucket, so it
+        needs no lock, and concurrent callers queue up behind each other's
+        debt instead of behind each other's sleep.
+        """
+        now = asyncio.get_running_loop().time()
+        elapsed = now - self._refilled_at
+        self._tokens = min(self.rate, self._tokens + elapsed * self.rate) - 1
+        self._refilled_at = now
 
-        if time_since_last < self.rate_limit_delay:
-            await asyncio.sleep(self.rate_limit_delay - time_since_last)
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.rate)
+
+    async def _request(self, endpoint: str, params: Dict[str, Any]) -> bytes:
+        """Call an E-utilities endpoint and return the raw response body.
+
+        Requests go through the process-wide pooled client, so concurrent
+        searches reuse warm connections to NCBI instead of opening a new
+        one per call.
+        """
+        response = await http_client.get(
+            f"{_EUTILS_URL}/{endpoint}", params={**params, **self.identity}
+        )
+        response.raise_for_status()
+        return response.content
 
-        self.last_request_time = asyncio.get_event_loop().time()
+    async def _get(self, endpoint: str, params: Dict[str, Any]) -> Any:
+        """Call an E-utilities endpoint and parse it with Biopython's reader."""
+        return Entrez.read(io.BytesIO(await self._request(endpoint, params)))
 
     async def search(
         self, query: str, max_results: int = 20, sort: str = "relevance"
@@ -58,22 +140,10 @@ class PubMedTool:
         await self._rate_limit()
 
         try:
-            # Run synchronous Entrez call in thread pool
-            loop = asyncio.get_event_loop()
-            handle = await loop.run_in_executor(
-                None,
-                lambda: Entrez.esearch(
-                    db="pubmed",
-                    term=query,
-                    retmax=max_results,
-                    sort=sort,
-                    usehistory="y",
-                ),
+            record = await self._get(
+                "esearch.fcgi",
+                {"db": "pubmed", "term": query, "retmax": max_results, "sort": sort},
             )
-
-            record = Entrez.read(handle)
-            handle.close()
-
             return record.get("IdList", [])
 
         except Exception as e:
@@ -97,74 +167,76 @@ class PubMedTool:
         await self._rate_limit()
 
         try:
-            # Fetch records
-            loop = asyncio.get_event_loop()
-            handle = await loop.run_in_executor(
-                None,
-                lambda: Entrez.efetch(
-                    db="pubmed",
-                    id=",".join(pubmed_ids),
-                    rettype="medline",
-                    retmode="xml",
-                ),
+            content = await self._request(
+                "efetch.fcgi",
+                {
+                    "db": "pubmed",
+                    "id": ",".join(pubmed_ids),
+                    "rettype": "medline",
+                    "retmode": "xml",
+                },
             )
 
-            records = Entrez.read(handle)
-            handle.close()
-
-            # Parse each record into Study objects
-            studies = []
-            for record in records.get("PubmedArticle", []):
-                study = self._parse_record(record)
-                if study:
-                    studies.append(study)
-
-            return studies
+            # Parsing a full fetch is pure CPU; run it off the event loop so
+            # other requests keep being served meanwhile
+            return await asyncio.to_thread(self._parse_articles, content)
 
         except Exception as e:
             raise Exception(f"PubMed fetch failed: {str(e)}")
 
-    def _parse_record(self, record: Dict[str, Any]) -> Study | None:
+    def _parse_articles(self, content: bytes) -> List[Study]:
+        """Parse an efetch XML response into Study objects.
+
+        Each record is parsed as soon as its closing tag is read, then
+        cleared, so the full document tree is never built.
+        """
+        studies = []
+        for _, element in ET.iterparse(io.BytesIO(content)):
+            if element.tag != "PubmedArticle":
+                continue
+            study = self._parse_record(element)
+            if study:
+                studies.append(study)
+            element.clear()
+
+        return studies
+
+    def _parse_record(self, record: ET.Element) -> Study | None:
         """Parse a PubMed XML record into a Study object.
 
         Args:
-            record: PubMed article record from Entrez
+            record: PubmedArticle element from an efetch response
 
         Returns:
             Study object or None if parsing fails
         """
         try:
-            article = record.get("MedlineCitation", {}).get("Article", {})
-            medline = record.get("MedlineCitation", {})
+            medline = record.find("MedlineCitation")
+            article = medline.find("Article")
 
             # Extract PubMed ID
-            pubmed_id = str(medline.get("PMID", ""))
+            pubmed_id = medline.findtext("PMID", "")
 
             # Extract title
-            title = article.get("ArticleTitle", "")
+            title = _element_text(article.find("ArticleTitle"))
 
             # Extract authors
-            authors_list = article.get("AuthorList", [])
-            authors = self._format_authors(authors_list)
+            authors = self._format_authors(article.findall("AuthorList/Author"))
 
             # Extract journal
-            journal = article.get("Journal", {}).get("Title", "Unknown Journal")
+            journal = article.findtext("Journal/Title", "Unknown Journal")
 
             # Extract year
-            pub_date = (
-                article.get("Journal", {}).get("JournalIssue", {}).get("PubDate", {})
+            year = self._extract_year(
+                article.findtext("Journal/JournalIssue/PubDate/Year")
             )
-            year = self._extract_year(pub_date)
 
             # Extract abstract
-            abstract_sections = article.get("Abstract", {}).get("AbstractText", [])
-            abstract = self._format_abstract(abstract_sections)
-
-            # Determine study type from abstract/title
-            study_type = self._identify_study_type(title, abstract)
+            abstract = self._format_abstract(article.findall("Abstract/AbstractText"))
 
-            # Estimate sample size from abstract
-            sample_size = self._extract_sample_size(abstract)
+            # Determine study type and estimate sample size from the full
+            # title/abstract, before the abstract is cut
+            study_type, sample_size = self._classify(title, abstract)
 
             # Build PubMed URL
             url = f"https://pubmed.ncbi.nlm.nih.gov/{pubmed_id}/"
@@ -177,7 +249,7 @@ class PubMedTool:
                 year=year,
                 study_type=study_type,
                 sample_size=sample_size,
-                abstract=abstract,
+                abstract=abstract[:_MAX_ABSTRACT_CHARS],
                 url=url,
             )
 
@@ -185,11 +257,11 @@ class PubMedTool:
             # Skip records that fail to parse
             return None
 
-    def _format_authors(self, authors_list: List[Dict]) -> str:
+    def _format_authors(self, authors_list: List[ET.Element]) -> str:
         """Format author list as comma-separated string.
 
         Args:
-            authors_list: List of author dictionaries from PubMed
+            authors_list: Author elements from PubMed
 
         Returns:
             Formatted author string (e.g., "Smith J, Jones K, Williams L")
@@ -200,8 +272,8 @@ class PubMedTool:
         # Take first 3 authors
         authors = []
         for author in authors_list[:3]:
-            last_name = author.get("LastName", "")
-            initials = author.get("Initials", "")
+            last_name = author.findtext("LastName", "")
+            initials = author.findtext("Initials", "")
             if last_name:
                 authors.append(f"{last_name} {initials}".strip())
 
@@ -211,16 +283,15 @@ class PubMedTool:
 
         return ", ".join(authors) if authors else "Unknown"
 
-    def _extract_year(self, pub_date: Dict) -> int:
-        """Extract publication year from PubDate dict.
+    def _extract_year(self, year: str | None) -> int:
+        """Extract publication year from the PubDate Year text.
 
         Args:
-            pub_date: PubDate dictionary from PubMed
+            year: PubDate Year from PubMed, if present
 
         Returns:
             Publication year as integer, or current year if not found
         """
-        year = pub_date.get("Year")
         if year:
             try:
                 return int(year)
@@ -229,7 +300,7 @@ class PubMedTool:
 
         return datetime.now().year
 
-    def _format_abstract(self, abstract_sections: List) -> str:
+    def _format_abstract(self, abstract_sections: List[ET.Element]) -> str:
         """Extract Results and Conclusions from a structured abstract.
 
         For structured abstracts (with labeled sections), only Results and
@@ -242,7 +313,7 @@ class PubMedTool:
         returned as a fallback.
 
         Args:
-            abstract_sections: List of abstract text sections from PubMed
+            abstract_sections: AbstractText elements from PubMed
 
         Returns:
             Extracted abstract text
@@ -250,100 +321,61 @@ class PubMedTool:
         if not abstract_sections:
             return "No abstract available"
 
-        if not isinstance(abstract_sections, list):
-            return str(abstract_sections)
+        texts = [_element_text(section) for section in abstract_sections]
+        labels = [section.get("Label") for section in abstract_sections]
 
         # Check if any sections have labels (structured abstract)
-        has_labels = any(
-            hasattr(section, "attributes") and "Label" in section.attributes
-            for section in abstract_sections
-        )
-
-        if has_labels:
+        if any(label is not None for label in labels):
             # Structured: extract only Results and Conclusions
-            target_labels = {"RESULTS", "CONCLUSIONS", "CONCLUSION", "FINDINGS"}
-            parts = []
-            for section in abstract_sections:
-                if hasattr(section, "attributes") and "Label" in section.attributes:
-                    label = section.attributes["Label"]
-                    if label.upper() in target_labels:
-                        parts.append(f"{label}: {str(section)}")
+            parts = [
+                f"{label}: {text}"
+                for label, text in zip(labels, texts)
+                if label is not None and label.upper() in _FINDINGS_LABELS
+            ]
             # If somehow no target sections matched, fall back to full abstract
             if not parts:
-                return " ".join(str(s) for s in abstract_sections)
+                return " ".join(texts)
             return " ".join(parts)
 
         # Unstructured: return full text
-        return " ".join(str(section) for section in abstract_sections)
-
-    def _identify_study_type(self, title: str, abstract: str) -> str:
-        """Identify study type from title and abstract.
-
-        Args:
-            title: Study title
-            abstract: Study abstract
-
-        Returns:
-            Study type string
-        """
-        combined = (title + " " + abstract).lower()
-
-        # Check for meta-analysis (highest quality)
-        if re.search(r"meta-analysis|meta analysis|systematic review", combined):
-            return "meta-analysis"
-
-        # Check for RCT
-        if re.search(
-            r"randomized controlled trial|randomized control trial|rct|randomised",
-            combined,
-        ):
-            return "rct"
-
-        # Check for cohort study
-        if re.search(r"cohort study|prospective study|longitudinal", combined):
-            return "cohort study"
-
-        # Check for case-control
-        if re.search(r"case-control|case control", combined):
-            return "case-control"
-
-        # Check for review
-        if re.search(r"review|literature review", combined):
-            return "review"
+        return " ".join(texts)
 
-        # Default to observational
-        return "observational"
+    def _classify(self, title: str, abstract: str) -> tuple[str, int]:
+        """Identify study type and estimate sample size.
 
-    def _extract_sample_size(self, abstract: str) -> int:
-        """Extract sample size from abstract.
+        The text is lowercased once and each pattern set is a single regex
+        scan over it.
 
         Args:
+            title: Study title
             abstract: Study abstract
 
         Returns:
-            Estimated sample size as integer
+            Study type string, and estimated sample size (0 if not found)
         """
-        # Look for patterns like "n=150", "N = 200", "n=1,500"
-        patterns = [
-            r"n\s*=\s*(\d+,?\d*)",
-            r"N\s*=\s*(\d+,?\d*)",
-            r"(\d+,?\d*)\s+participants",
-            r"(\d+,?\d*)\s+subjects",
-            r"(\d+,?\d*)\s+patients",
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, abstract, re.IGNORECASE)
-            if match:
-                # Extract number and remove commas
-                num_str = match.group(1).replace(",", "")
-                try:
-                    return int(num_str)
-                except ValueError:
-                    pass
-
-        # Default if not found
-        return 0
+        abstract = abstract.lower()
+        combined = title.lower() + " " + abstract
+
+        # Study type from title and abstract; default to observational
+        study_type = "observational"
+        found = {match.lastgroup for match in _STUDY_TYPE_RE.finditer(combined)}
+        for group, candidate in _STUDY_TYPES.items():
+            if group in found:
+                study_type = candidate
+                break
+
+        # Sample size from the abstract only; default to 0
+        sample_size = 0
+        numbers = {}
+        for match in _SAMPLE_SIZE_RE.finditer(abstract):
+            numbers.setdefault(match.lastgroup, match[match.lastgroup])
+        for group in _SAMPLE_SIZE_GROUPS:
+            if group in numbers:
+                # Remove thousands separators
+                sample_size = int(numbers[group].replace(",", ""))
+                break
+
+        return study_type, sample_size
 
     async def search_and_fetch(self, query: str, max_results: int = 20) -> List[Study]:
         """Convenience method: search and fetch in one call.
@@ -360,3 +392,51 @@ class PubMedTool:
             return []
 
         return await self.fetch_details(pubmed_ids)
+
+    async def search_many(
+        self,
+        queries: List[str],
+        max_results: int = 20,
+        max_concurrent: int | None = None,
+        limiter: asyncio.Semaphore | None = None,
+    ) -> List[Study]:
+        """Search several queries in parallel and fetch all hits in one call.
+
+        The searches run concurrently; their IDs are merged in query order
+        without duplicates and fetched with a single efetch request, instead
+        of one fetch per query. A failed search is skipped.
+
+        Args:
+            queries: Search queries
+            max_results: Maximum results per query
+            max_concurrent: Maximum searches in flight at once
+                (default: settings.pubmed_max_concurrency)
+            limiter: Semaphore bounding the searches instead, shared with
+                other calls so they count against one limit together
+                (max_concurrent is then ignored)
+
+        Returns:
+            List of Study objects with full metadata
+
+        Raises:
+            Exception: If the PubMed fetch fails
+        """
+        semaphore = limiter or asyncio.Semaphore(
+            max_concurrent or settings.pubmed_max_concurrency
+        )
+
+        async def bounded_search(query: str) -> List[str]:
+            async with semaphore:
+                return await self.search(query, max_results)
+
+        results = await asyncio.gather(
+            *(bounded_search(query) for query in queries), return_exceptions=True
+        )
+
+        # dict preserves first-seen order while dropping duplicate IDs
+        pubmed_ids = {}
+        for result in results:
+            if not isinstance(result, BaseException):
+                pubmed_ids.update(dict.fromkeys(result))
+
+        return await self.fetch_details(list(pubmed_ids)[:_MAX_FETCH_IDS])
@@ -0,0 +1,200 @@
+"""JSON parsing for LLM responses.
+
+LLM output often wraps JSON in prose or code fences, and arrives token by
+token. These helpers pick complete values out of a (possibly partially
+received) response so callers can act on them without fence stripping or
+waiting for the whole completion.
+"""
+
+import json
+import re
+
+import orjson
+
+# strict=False allows literal control chars (newlines, tabs) inside strings;
+# LLMs emit these regularly in multi-line text fields
+_LENIENT_DECODER = json.JSONDecoder(strict=False)
+
+# Deletes C0 control chars other than tab/newline/CR. Models occasionally
+# emit stray ones (e.g. \x00, \x0b) that orjson rejects, which would push an
+# otherwise valid response onto the slower pure-Python decoder.
+_CTRL_TRANSLATE = dict.fromkeys(c for c in range(32) if c not in (9, 10, 13))
+
+# A comma directly before a closing bracket, e.g. '"a": 1,}'
+_TRAILING_COMMA_RE = re.compile(r",(\s*[}\]])")
+
+
+def extract_json_object(text: str) -> dict:
+    """Decode the first JSON object in an LLM response.
+
+    Surrounding prose or markdown code fences are ignored, so no fence
+    stripping is needed before parsing. The outermost braces are tried with
+    orjson first, after dropping stray control characters; output it still
+    rejects (e.g. raw newlines inside strings, or trailing text containing
+    braces) goes through the lenient stdlib decoder, and only if that fails
+    too are trailing commas repaired.
+
+    Example:
+        >>> extract_json_object('```json\\n{"valid": true}\\n```')
+        {'valid': True}
+        >>> extract_json_object('{"suggestions": ["a", "b",],}')
+        {'suggestions': ['a', 'b']}
+
+    Raises:
+        json.JSONDecodeError: If the text contains no valid JSON object
+    """
+    start = text.find("{")
+    if start == -1:
+        raise json.JSONDecodeError("No JSON object found", text, 0)
+    try:
+        candidate = text[start : text.rfind("}") + 1]
+        return orjson.loads(candidate.translate(_CTRL_TRANSLATE))
+    except orjson.JSONDecodeError:
+        pass
+    try:
+        result, _ = _LENIENT_DECODER.raw_decode(text, start)
+    except json.JSONDecodeError:
+        repaired = _TRAILING_COMMA_RE.sub(r"\1", text[start:])
+        if repaired == text[start:]:
+            raise
+        result, _ = _LENIENT_DECODER.raw_decode(repaired)
+    return result
+
+
+class JSONArrayStream:
+    """Incrementally decode the elements of a streamed JSON array.
+
+    Feed raw text chunks as they arrive; each call returns the array elements
+    that became complete since the previous call. Anything before the opening
+    ``[`` (e.g. a markdown code fence) is skipped.
+
+    Example:
+        >>> stream = JSONArrayStream()
+        >>> stream.feed('```json\\n[{"score": 8')
+        []
+        >>> stream.feed('}, {"score": 6}]')
+        [{'score': 8}, {'score': 6}]
+        >>> stream.closed
+        True
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.closed = False  # True once the closing ']' has been seen
+        self._pos = -1  # Start of the next element; -1 until '[' is found
+        self._decoder = json.JSONDecoder()
+
+    def feed(self, chunk: str) -> list:
+        """Append a chunk and return any newly completed array elements."""
+        self.buffer += chunk
+
+        if self._pos < 0:
+            start = self.buffer.find("[")
+            if start == -1:
+                return []
+            self._pos = start + 1
+
+        items = []
+        buffer = self.buffer
+        while not self.closed:
+            # Skip whitespace and separators between elements
+            pos = self._pos
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            self._pos = pos
+
+            if pos >= len(buffer):
+                break
+            if buffer[pos] == "]":
+                self.closed = True
+                break
+
+            try:
+                item, end = self._decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                break  # Element not fully received yet
+
+            # A bare number at the end of the buffer may still be growing
+            if end == len(buffer) and not isinstance(item, (dict, list, str)):
+                break
+
+            items.append(item)
+            self._pos = end
+
+        return items
+
+
+class JSONObjectStream:
+    """Incrementally decode the top-level fields of a streamed JSON object.
+
+    Feed raw text chunks as they arrive; each call returns the ``(key,
+    value)`` pairs whose value became complete since the previous call, so a
+    field can be shown before the rest of the object has been generated.
+    Anything before the opening ``{`` (e.g. a markdown code fence) is skipped.
+    String values may contain raw newlines, as LLMs tend to emit.
+
+    Example:
+        >>> stream = JSONObjectStream()
+        >>> stream.feed('```json\\n{"verdict": "Supp')
+        []
+        >>> stream.feed('orted", "bottom_line": "Yes."}')
+        [('verdict', 'Supported'), ('bottom_line', 'Yes.')]
+        >>> stream.closed
+        True
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.closed = False  # True once the closing '}' has been seen
+        self.fields: dict = {}  # Every field decoded so far
+        self._pos = -1  # Start of the next key; -1 until '{' is found
+
+    def _skip(self, pos: int, chars: str) -> int:
+        """Advance past any of ``chars`` starting at ``pos``."""
+        buffer = self.buffer
+        while pos < len(buffer) and buffer[pos] in chars:
+            pos += 1
+        return pos
+
+    def feed(self, chunk: str) -> list:
+        """Append a chunk and return any newly completed (key, value) pairs."""
+        self.buffer += chunk
+
+        if self._pos < 0:
+            start = self.buffer.find("{")
+            if start == -1:
+                return []
+            self._pos = start + 1
+
+        pairs = []
+        buffer = self.buffer
+        while not self.closed:
+            pos = self._skip(self._pos, " \t\r\n,")
+            self._pos = pos
+
+            if pos >= len(buffer):
+                break
+            if buffer[pos] == "}":
+                self.closed = True
+                break
+
+            try:
+                key, pos = _LENIENT_DECODER.raw_decode(buffer, pos)
+                pos = self._skip(pos, " \t\r\n")
+                if buffer[pos : pos + 1] != ":":
+                    break  # Separator not received yet
+                value, end = _LENIENT_DECODER.raw_decode(
+                    buffer, self._skip(pos + 1, " \t\r\n")
+                )
+            except json.JSONDecodeError:
+                break  # Pair not fully received yet
+
+            # A bare number at the end of the buffer may still be growing
+            if end == len(buffer) and not isinstance(value, (dict, list, str)):
+                break
+
+            self.fields[key] = value
+            pairs.append((key, value))
+            self._pos = end
+
+        return pairs
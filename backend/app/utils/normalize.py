@@ -1,9 +1,73 @@
 """Claim normalization utilities for consistent cache keys."""
 
+import functools
+import hashlib
 import re
+import string
 import unicodedata
 
+# Function words that carry no meaning when comparing health claims
+_STOPWORDS = frozenset(
+    {
+        "a",
+        "an",
+        "the",
+        "is",
+        "are",
+        "was",
+        "were",
+        "be",
+        "been",
+        "does",
+        "do",
+        "did",
+        "can",
+        "could",
+        "will",
+        "would",
+        "should",
+        "it",
+        "its",
+        "this",
+        "that",
+        "these",
+        "those",
+        "of",
+        "for",
+        "to",
+        "in",
+        "on",
+        "at",
+        "by",
+        "with",
+        "and",
+        "or",
+        "really",
+        "actually",
+        "truly",
+        "help",
+        "helps",
+    }
+)
 
+# One-pass cleanup of ASCII text for normalize_claim: lowercase letters and
+# delete punctuation except hyphens (every ASCII char outside [\w\s-])
+_ASCII_CLEANUP = str.maketrans(
+    string.ascii_uppercase,
+    string.ascii_lowercase,
+    "".join(c for c in map(chr, range(128)) if not re.match(r"[\w\s-]", c)),
+)
+
+# The same punctuation rule for non-ASCII text
+_PUNCTUATION_RE = re.compile(r"[^\w\s-]")
+
+# Approximate LLM tokens: each word and each punctuation mark counts as one
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+
+# Called several times per request for the same claim (cache tiers, claim
+# hash, validation and verdict keys), and popular claims repeat across users
+@functools.lru_cache(maxsize=4096)
 def normalize_claim(claim: str) -> str:
     """Normalize a health claim for use as a cache key.
 
@@ -11,7 +75,8 @@ def normalize_claim(claim: str) -> str:
 
     Transformations:
     - Convert to lowercase
-    - Normalize unicode characters
+    - Normalize unicode compatibility forms (NFKC), keeping accents and
+      non-Latin scripts so distinct claims keep distinct keys
     - Remove punctuation (except hyphens in compound words)
     - Collapse multiple spaces
     - Strip leading/trailing whitespace
@@ -21,21 +86,66 @@ def normalize_claim(claim: str) -> str:
         'does creatine improve muscle strength'
         >>> normalize_claim("DOES   Creatine IMPROVE muscle-strength??")
         'does creatine improve muscle-strength'
+        >>> normalize_claim("¿La CAFEÍNA mejora la memoria?")
+        'la cafeína mejora la memoria'
+    """
+    return _normalize(claim)
+
+
+def _normalize(text: str) -> str:
+    """Apply the normalize_claim transformations, without memoization."""
+    # Convert to lowercase and remove punctuation except hyphens (preserve
+    # compound words like "muscle-strength"). ASCII text, the common case,
+    # has no compatibility forms and needs only the one-pass table.
+    if text.isascii():
+        text = text.translate(_ASCII_CLEANUP)
+    else:
+        # NFKC folds full-width letters and ligatures but, unlike stripping
+        # to ASCII, doesn't drop accented or non-Latin characters
+        text = unicodedata.normalize("NFKC", text).lower()
+        text = _PUNCTUATION_RE.sub("", text)
+
+    # Collapse whitespace runs into single spaces, stripping both ends
+    return " ".join(text.split())
+
+
+def hash_claim(normalized_claim: str) -> bytes:
+    """SHA-256 digest of a normalized claim, the compact cache lookup key."""
+    return hashlib.sha256(normalized_claim.encode()).digest()
+
+
+def content_words(text: str) -> list[str]:
+    """Split text into its normalized content words, dropping function words.
+
+    Examples:
+        >>> content_words("Does creatine really improve muscle strength?")
+        ['creatine', 'improve', 'muscle', 'strength']
     """
-    # Normalize unicode (e.g., convert accented chars to ASCII equivalents)
-    text = unicodedata.normalize("NFKD", claim)
-    text = text.encode("ascii", "ignore").decode("ascii")
+    # Not memoized: study titles and abstracts rarely repeat
+    return [word for word in _normalize(text).split() if word not in _STOPWORDS]
+
 
-    # Convert to lowercase
-    text = text.lower()
+def count_tokens(text: str) -> int:
+    """Estimate how many LLM tokens a text uses.
+
+    Examples:
+        >>> count_tokens("Creatine (5 g/day) improved strength.")
+        10
+    """
+    return sum(1 for _ in _TOKEN_RE.finditer(text))
 
-    # Remove punctuation except hyphens (preserve compound words like "muscle-strength")
-    text = re.sub(r"[^\w\s-]", "", text)
 
-    # Collapse multiple spaces into single space
-    text = re.sub(r"\s+", " ", text)
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """Cut text after its first max_tokens tokens (see count_tokens).
 
-    # Strip leading/trailing whitespace
-    text = text.strip()
+    Unlike slicing by characters, the cut never splits a word, and the
+    budget tracks what the model is billed for rather than string length.
 
+    Examples:
+        >>> truncate_tokens("Creatine improved strength in older adults.", 3)
+        'Creatine improved strength'
+    """
+    for i, match in enumerate(_TOKEN_RE.finditer(text), 1):
+        if i == max_tokens:
+            return text[: match.end()]
     return text
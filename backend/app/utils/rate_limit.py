@@ -6,82 +6,80 @@ Uses an in-memory sliding window.  Suitable for single-process deployments
 Default: 5 requests per 60-second window per IP.
 """
 
+import asyncio
 import time
 import logging
-from collections import defaultdict, deque
-from threading import Lock
+from collections import OrderedDict, deque
 
 from fastapi import HTTPException, Request
 
 logger = logging.getLogger(__name__)
 
-# Global state — lives for the lifetime of the process.
-# key: client IP  →  value: deque of request timestamps within the current window
-_request_log: dict[str, deque[float]] = defaultdict(deque)
-_lock = Lock()  # Thread safety for cleanup operations
+# Global state — lives for the lifetime of the process. Only touched from the
+# event loop, with no await in between reads and writes, so no lock is needed.
+# key: client IP  →  value: deque of request timestamps within the current window.
+# Kept in order of each IP's latest request, least recent first.
+_request_log: OrderedDict[str, deque[float]] = OrderedDict()
 
 # Tunables
 WINDOW_SECONDS: int = 60
 MAX_REQUESTS: int = 5
 
-# Cleanup settings - remove stale IPs to prevent memory leak
-_CLEANUP_INTERVAL: int = 300  # Run cleanup every 5 minutes
-_STALE_THRESHOLD: int = WINDOW_SECONDS * 2  # Remove IPs with no activity for 2x window
-_last_cleanup: float = 0.0
+# Memory bounds - IPs with no activity for 2x window are dropped, and past
+# _MAX_IPS the least recently active IP is dropped, whatever its age
+_STALE_THRESHOLD: int = WINDOW_SECONDS * 2
+_MAX_IPS: int = 100_000
 
 
-def _cleanup_stale_entries() -> None:
-    """Remove IP entries that haven't had activity recently.
+def _evict_entries(now: float) -> None:
+    """Remove IP entries that are stale or over the _MAX_IPS bound.
 
     This prevents unbounded memory growth from many unique IPs.
-    Called periodically during rate limit checks.
+    Called whenever a new IP is added. IPs are ordered by their latest
+    request, so only the entries being removed (and one more) are visited,
+    instead of a periodic pass over every IP.
     """
-    global _last_cleanup
-    now = time.time()
+    stale_threshold = now - _STALE_THRESHOLD
+    removed = 0
 
-    # Only run cleanup periodically
-    if now - _last_cleanup < _CLEANUP_INTERVAL:
-        return
-
-    with _lock:
-        # Double-check after acquiring lock
-        if now - _last_cleanup < _CLEANUP_INTERVAL:
-            return
-
-        stale_threshold = now - _STALE_THRESHOLD
-        stale_ips = []
-
-        for ip, timestamps in _request_log.items():
-            # If the most recent request is older than threshold, mark for removal
-            if not timestamps or timestamps[-1] < stale_threshold:
-                stale_ips.append(ip)
-
-        for ip in stale_ips:
-            del _request_log[ip]
+    # Stop at the first IP that is both recent and within the bound
+    while _request_log:
+        timestamps = next(iter(_request_log.values()))
+        if timestamps[-1] >= stale_threshold and len(_request_log) <= _MAX_IPS:
+            break
+        _request_log.popitem(last=False)
+        removed += 1
 
-        if stale_ips:
-            logger.debug(f"Rate limiter cleanup: removed {len(stale_ips)} stale IPs")
-
-        _last_cleanup = now
+    if removed:
+        logger.debug("Rate limiter evicted %d IPs", removed)
 
 
 async def rate_limit(request: Request) -> None:
     """FastAPI dependency that enforces per-IP rate limiting.
 
-    Raises a 429 response with a Retry-After header when the limit is hit.
+    Raises a 429 response with Retry-After and X-RateLimit-* headers (limit,
+    remaining, and the epoch second the next slot opens) when the limit is hit.
 
     Usage:
         @router.post("/verify", dependencies=[Depends(rate_limit)])
         async def verify_claim(...): ...
     """
-    # Periodically clean up stale entries to prevent memory leak
-    _cleanup_stale_entries()
-
-    ip = request.client.host if request.client else "unknown"
-    now = time.time()
+    # Read the (host, port) pair straight from the ASGI scope rather than
+    # building a Request.client Address for every call
+    client = request.scope.get("client")
+    ip = client[0] if client else "unknown"
+    # Timestamps come from the event loop's monotonic clock, so wall-clock
+    # adjustments (NTP steps) can't stretch or shrink a window
+    now = asyncio.get_running_loop().time()
     window_start = now - WINDOW_SECONDS
 
-    log = _request_log[ip]
+    log = _request_log.get(ip)
+    if log is None:
+        # First request in the log for this IP: nothing to expire or limit,
+        # and the entry is only created once the request is admitted
+        _request_log[ip] = deque((now,))
+        _evict_entries(now)
+        return
 
     # Drop timestamps that have fallen outside the window
     while log and log[0] <= window_start:
@@ -89,15 +87,22 @@ async def rate_limit(request: Request) -> None:
 
     if len(log) >= MAX_REQUESTS:
         # Oldest request in the window determines when the next slot opens
-        retry_after = int(log[0] - window_start) + 1
-        logger.info(f"Rate limit exceeded for IP (retry_after={retry_after}s)")
+        opens_in = log[0] - window_start
+        retry_after = int(opens_in) + 1
+        logger.info("Rate limit exceeded for IP (retry_after=%ss)", retry_after)
         raise HTTPException(
             status_code=429,
             detail={
                 "message": "Too many requests. Please wait before trying again.",
                 "retry_after": retry_after,
             },
-            headers={"Retry-After": str(retry_after)},
+            headers={
+                "Retry-After": str(retry_after),
+                "X-RateLimit-Limit": str(MAX_REQUESTS),
+                "X-RateLimit-Remaining": "0",
+                "X-RateLimit-Reset": str(int(time.time() + opens_in)),
+            },
         )
 
     log.append(now)
+    _request_log.move_to_end(ip)
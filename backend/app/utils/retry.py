@@ -1,9 +1,15 @@
 """Retry utility for Groq API calls with backoff on rate limits."""
 
 import asyncio
+import logging
+import random
+from collections.abc import AsyncIterator
+
 import groq
 from langchain_core.messages import BaseMessage
 
+logger = logging.getLogger(__name__)
+
 
 class RateLimitExceeded(Exception):
     """Raised when all retries are exhausted due to rate limiting."""
@@ -11,24 +17,75 @@ class RateLimitExceeded(Exception):
     pass
 
 
+def _retry_wait(
+    error: groq.RateLimitError,
+    attempt: int,
+    base: float = 1.0,
+    jitter: bool = True,
+    max_wait: float = 30.0,
+) -> float:
+    """Seconds to wait before retrying a rate-limited request.
+
+    Reads the Retry-After header from the response when present, otherwise
+    falls back to exponential backoff (base * 2, 4, 8...), capped at
+    ``max_wait``. With jitter, concurrent requests that were limited together
+    don't all retry at the same instant: a backoff wait is drawn from its
+    upper half (equal jitter), while a Retry-After wait gets up to ``base``
+    extra seconds, since retrying before it would only be limited again.
+
+    Raises:
+        RateLimitExceeded: If Retry-After asks for longer than ``max_wait``,
+            as retrying sooner would only be limited again
+    """
+    if hasattr(error, "response") and error.response is not None:
+        retry_after = error.response.headers.get("retry-after")
+        if retry_after:
+            try:
+                wait = int(retry_after)
+            except (ValueError, TypeError):
+                pass
+            else:
+                if wait > max_wait:
+                    raise RateLimitExceeded(
+                        "Groq API rate limit reached. Please try again in a minute."
+                    ) from error
+                return wait + random.uniform(0, base) if jitter else wait
+
+    wait = min(base * 2 ** (attempt + 1), max_wait)
+    if jitter:
+        wait *= 0.5 + random.random() / 2
+    return wait
+
+
 async def invoke_with_retry(
-    llm, messages: list[BaseMessage], max_retries: int = 3
+    llm,
+    messages: list[BaseMessage],
+    max_retries: int = 3,
+    base: float = 1.0,
+    jitter: bool = True,
+    max_wait: float = 30.0,
 ) -> BaseMessage:
     """Invoke an LLM with automatic retry on Groq 429 rate-limit errors.
 
     Reads the Retry-After header from the response to know how long to wait.
-    Falls back to exponential backoff (2s, 4s, 8s) if the header is missing.
+    Falls back to exponential backoff (base * 2, 4, 8...) if the header is
+    missing.
 
     Args:
         llm: A LangChain ChatGroq instance.
         messages: The messages to send.
         max_retries: Number of retry attempts before giving up.
+        base: Backoff unit in seconds; retry n (from 1) waits base * 2**n.
+        jitter: Randomize each wait (see _retry_wait).
+        max_wait: Upper bound on any single wait, in seconds. A longer
+            Retry-After gives up at once instead of retrying early.
 
     Returns:
         The LLM response message.
 
     Raises:
-        RateLimitExceeded: If all retries are exhausted.
+        RateLimitExceeded: If all retries are exhausted, or the server asks
+            to wait longer than max_wait.
     """
     for attempt in range(max_retries + 1):
         try:
@@ -39,17 +96,68 @@ async def invoke_with_retry(
                     "Groq API rate limit reached. Please try again in a minute."
                 ) from e
 
-            # Try to read Retry-After from the response headers
-            wait = 2 ** (attempt + 1)  # fallback: 2s, 4s, 8s
-            if hasattr(e, "response") and e.response is not None:
-                retry_after = e.response.headers.get("retry-after")
-                if retry_after:
-                    try:
-                        wait = int(retry_after)
-                    except (ValueError, TypeError):
-                        pass
-
-            print(
-                f"⏳ Rate limited (attempt {attempt + 1}/{max_retries}). Waiting {wait}s..."
+            wait = _retry_wait(e, attempt, base, jitter, max_wait)
+            logger.warning(
+                "Rate limited (attempt %d/%d). Waiting %.1fs...",
+                attempt + 1,
+                max_retries,
+                wait,
+            )
+            await asyncio.sleep(wait)
+
+
+async def stream_with_retry(
+    llm,
+    messages: list[BaseMessage],
+    max_retries: int = 3,
+    base: float = 1.0,
+    jitter: bool = True,
+    max_wait: float = 30.0,
+    **kwargs,
+) -> AsyncIterator[str]:
+    """Stream an LLM response as text chunks, retrying Groq 429 rate-limit errors.
+
+    Only a rate limit raised before the first chunk is retried. Once output
+    has started flowing a retry would replay text the caller already consumed,
+    so later errors propagate unchanged.
+
+    Args:
+        llm: A LangChain ChatGroq instance.
+        messages: The messages to send.
+        max_retries: Number of retry attempts before giving up.
+        base: Backoff unit in seconds; retry n (from 1) waits base * 2**n.
+        jitter: Randomize each wait (see _retry_wait).
+        max_wait: Upper bound on any single wait, in seconds. A longer
+            Retry-After gives up at once instead of retrying early.
+        **kwargs: Per-call model parameters (e.g. max_tokens).
+
+    Yields:
+        Text content of each streamed chunk.
+
+    Raises:
+        RateLimitExceeded: If all retries are exhausted, or the server asks
+            to wait longer than max_wait.
+    """
+    for attempt in range(max_retries + 1):
+        started = False
+        try:
+            async for chunk in llm.astream(messages, **kwargs):
+                started = True
+                yield chunk.content
+            return
+        except groq.RateLimitError as e:
+            if started:
+                raise
+            if attempt == max_retries:
+                raise RateLimitExceeded(
+                    "Groq API rate limit reached. Please try again in a minute."
+                ) from e
+
+            wait = _retry_wait(e, attempt, base, jitter, max_wait)
+            logger.warning(
+                "Rate limited (attempt %d/%d). Waiting %.1fs...",
+                attempt + 1,
+                max_retries,
+                wait,
             )
             await asyncio.sleep(wait)
@@ -0,0 +1,78 @@
+"""In-process cache for LLM results keyed on a claim's content words.
+
+Popular claims recur with small wording changes ("Does creatine work?",
+"does creatine really work"). Exact-text keys miss these, so entries are
+keyed on the sequence of normalized content words instead: casing,
+punctuation and function words don't matter, but every meaningful word must
+match, in the same order.
+
+Matching on vector similarity would also catch rephrasings with different
+words, but it conflates claims that differ in one decisive word ("increase"
+vs "decrease" the risk of heart disease) and would serve one claim the
+other's search queries and verdict. Order is kept for the same reason:
+"Does obesity cause depression?" and "Does depression cause obesity?" use
+the same words but ask opposite questions.
+"""
+
+import time
+from typing import Any
+
+from app.utils.normalize import content_words
+
+
+def claim_key(claim: str) -> tuple[str, ...]:
+    """Cache key for a claim: its normalized content words, in order.
+
+    Example:
+        >>> claim_key("Does creatine really work?")
+        ('creatine', 'work')
+    """
+    return tuple(content_words(claim))
+
+
+class SemanticCache:
+    """Bounded TTL cache returning the payload stored for the same content words.
+
+    Example:
+        >>> cache = SemanticCache()
+        >>> cache.put("Does creatine improve muscle strength?", ["q1"])
+        >>> cache.get("does creatine really improve muscle strength")
+        ['q1']
+        >>> cache.get("Does caffeine improve muscle strength?") is None
+        True
+        >>> cache.get("Does creatine reduce muscle strength?") is None
+        True
+        >>> cache.put("Does obesity cause depression?", ["q2"])
+        >>> cache.get("Does depression cause obesity?") is None
+        True
+    """
+
+    def __init__(self, ttl_seconds: float = 24 * 3600, max_entries: int = 512):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # Content-word key -> (payload, expires_at); insertion ordered
+        self._entries: dict[tuple[str, ...], tuple[Any, float]] = {}
+
+    def get(self, claim: str) -> Any | None:
+        """Return the payload stored for a claim with the same content words."""
+        key = claim_key(claim)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        payload, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        return payload
+
+    def put(self, claim: str, payload: Any) -> None:
+        """Store a payload for a claim, evicting the oldest entry when full."""
+        key = claim_key(claim)
+        if not key:
+            return
+
+        self._entries.pop(key, None)
+        if len(self._entries) >= self.max_entries:
+            del self._entries[next(iter(self._entries))]
+        self._entries[key] = (payload, time.monotonic() + self.ttl_seconds)
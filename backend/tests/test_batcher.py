@@ -0,0 +1,78 @@
+"""Behaviour tests for BatchScheduler micro-batching."""
+
+import asyncio
+
+from app.agents.batcher import BatchScheduler
+
+
+def test_lone_item_runs_alone():
+    """An item with no company within the window comes back as None."""
+    calls = []
+
+    async def process(items):
+        calls.append(items)
+        return [f"batched {item}" for item in items]
+
+    async def run():
+        scheduler = BatchScheduler(process, max_batch=8, window=0.01)
+        return await scheduler.submit("a")
+
+    assert asyncio.run(run()) is None
+    assert calls == []
+
+
+def test_concurrent_items_are_batched():
+    """Items arriving within the window share one call, results in order."""
+    calls = []
+
+    async def process(items):
+        calls.append(items)
+        return [f"batched {item}" for item in items]
+
+    async def run():
+        scheduler = BatchScheduler(process, max_batch=8, window=0.05)
+        return await asyncio.gather(*(scheduler.submit(item) for item in "abc"))
+
+    assert asyncio.run(run()) == ["batched a", "batched b", "batched c"]
+    assert calls == [["a", "b", "c"]]
+
+
+def test_failed_batch_falls_back_to_solo_runs():
+    """An expected error sends every item back to run alone."""
+
+    async def process(items):
+        raise ValueError("unparsable reply")
+
+    async def run():
+        scheduler = BatchScheduler(
+            process, max_batch=8, window=0.05, errors=(ValueError,)
+        )
+        return await asyncio.gather(*(scheduler.submit(item) for item in "ab"))
+
+    assert asyncio.run(run()) == [None, None]
+
+
+def test_missing_results_fall_back_to_solo_runs():
+    """Items the batch gave no (or a None) result for run alone."""
+
+    async def process(items):
+        return ["batched a", None]
+
+    async def run():
+        scheduler = BatchScheduler(process, max_batch=8, window=0.05)
+        return await asyncio.gather(*(scheduler.submit(item) for item in "abc"))
+
+    assert asyncio.run(run()) == ["batched a", None, None]
+
+
+def test_disabled_when_window_is_zero():
+    """A zero window disables batching entirely."""
+
+    async def process(items):
+        raise AssertionError("process must not be called")
+
+    async def run():
+        scheduler = BatchScheduler(process, max_batch=8, window=0)
+        return await asyncio.gather(*(scheduler.submit(item) for item in "ab"))
+
+    assert asyncio.run(run()) == [None, None]
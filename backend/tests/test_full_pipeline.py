@@ -27,7 +27,8 @@ async def test_full_pipeline():
     print("\n🔍 AGENT 1: SEARCH AGENT")
     print("=" * 80)
     search_agent = SearchAgent()
-    state = await search_agent.run(state)
+    # Each agent returns only its state update
+    state = {**state, **await search_agent.run(state)}
 
     raw_studies_count = len(state.get("raw_studies", []))
     queries_count = len(state.get("search_queries", []))
@@ -40,7 +41,7 @@ async def test_full_pipeline():
     print("⚖️  AGENT 2: QUALITY EVALUATOR")
     print("=" * 80)
     evaluator = QualityEvaluator()
-    state = await evaluator.run(state)
+    state = {**state, **await evaluator.run(state)}
 
     top_studies_count = len(state.get("top_studies", []))
     print(f"\n✅ Quality Evaluation Complete: Top {top_studies_count} studies selected")
@@ -50,7 +51,7 @@ async def test_full_pipeline():
     print("🔬 AGENT 3: SYNTHESIS AGENT")
     print("=" * 80)
     synthesizer = SynthesisAgent()
-    state = await synthesizer.run(state)
+    state = {**state, **await synthesizer.run(state)}
 
     # Final Results
     print("\n" + "=" * 80)
@@ -0,0 +1,116 @@
+"""Behaviour tests for the background job queue and SingleFlight."""
+
+import asyncio
+import time
+
+from app.services.jobs import JobFailed, JobQueue
+from app.services.singleflight import SingleFlight
+
+
+async def _wait_finished(queue: JobQueue, job_id: str) -> None:
+    """Poll until a job leaves the pending state."""
+    while queue.get(job_id).status == "pending":
+        await asyncio.sleep(0)
+
+
+def test_job_runs_to_done():
+    """A submitted claim is verified by a worker and its body stored."""
+
+    async def handler(claim):
+        return f"verified {claim}".encode()
+
+    async def run():
+        queue = JobQueue(handler, workers=1)
+        queue.start()
+        try:
+            job_id = queue.submit("Does creatine work?")
+            await _wait_finished(queue, job_id)
+            return queue.get(job_id)
+        finally:
+            await queue.stop()
+
+    job = asyncio.run(run())
+    assert job.status == "done"
+    assert job.result == b"verified Does creatine work?"
+    assert job.error is None
+    assert job.finished_at is not None
+
+
+def test_job_failed_becomes_error():
+    """JobFailed from the handler is surfaced as the job's error."""
+
+    async def handler(claim):
+        raise JobFailed({"status": 503, "detail": "rate limited"})
+
+    async def run():
+        queue = JobQueue(handler, workers=1)
+        queue.start()
+        try:
+            job_id = queue.submit("Does creatine work?")
+            await _wait_finished(queue, job_id)
+            return queue.get(job_id)
+        finally:
+            await queue.stop()
+
+    job = asyncio.run(run())
+    assert job.status == "error"
+    assert job.error == {"status": 503, "detail": "rate limited"}
+    assert job.result is None
+
+
+def test_finished_jobs_are_pruned_after_ttl():
+    """Finished jobs older than the TTL are forgotten; pending ones are kept."""
+
+    async def handler(claim):
+        return b"{}"
+
+    async def run():
+        queue = JobQueue(handler, workers=1, ttl_seconds=60)
+        finished = queue.submit("Does creatine work?")
+        pending = queue.submit("Does caffeine improve memory?")
+        queue.get(finished).finished_at = time.monotonic() - 61
+
+        queue.submit("Does vitamin D reduce depression?")  # Prunes on submit
+        return queue.get(finished), queue.get(pending)
+
+    finished, pending = asyncio.run(run())
+    assert finished is None
+    assert pending is not None
+
+
+def test_singleflight_runs_concurrent_calls_once():
+    """Concurrent calls for one key share a single run of fn."""
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "result"
+
+    async def run():
+        flight = SingleFlight()
+        return await asyncio.gather(flight.do("claim", work), flight.do("claim", work))
+
+    assert asyncio.run(run()) == ["result", "result"]
+    assert calls == 1
+
+
+def test_singleflight_cancelled_waiter_keeps_shared_task():
+    """Cancelling one waiter leaves the shared run going for the others."""
+
+    async def work():
+        await asyncio.sleep(0.01)
+        return "result"
+
+    async def run():
+        flight = SingleFlight()
+        first = asyncio.create_task(flight.do("claim", work))
+        second = asyncio.create_task(flight.do("claim", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        return first, await second
+
+    first, result = asyncio.run(run())
+    assert first.cancelled()
+    assert result == "result"
@@ -24,7 +24,7 @@ async def test_quality_evaluator():
     print("\n📋 Step 2: Scoring studies with Quality Evaluator...")
     evaluator = QualityEvaluator()
 
-    state_with_studies = {**search_result, "raw_studies": raw_studies}
+    state_with_studies = {**state, **search_result}
 
     result = await evaluator.run(state_with_studies)
 
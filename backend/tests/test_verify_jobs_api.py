@@ -0,0 +1,81 @@
+"""Tests for the /verify/jobs routes, with the pipeline stubbed out."""
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.api import verity
+from app.services.jobs import JobQueue
+from app.utils.rate_limit import rate_limit
+
+CLAIM = "Does creatine improve muscle strength?"
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """A client for the Verity router with a fresh, workerless job queue."""
+
+    async def handler(claim):
+        raise AssertionError("jobs are completed by the tests")
+
+    monkeypatch.setattr(verity, "jobs", JobQueue(handler))
+    app = FastAPI()
+    app.include_router(verity.router)
+    app.dependency_overrides[rate_limit] = lambda: None
+    return TestClient(app)
+
+
+def _check_returns(monkeypatch, cached):
+    async def cached_or_validated(claim, route):
+        return cached
+
+    monkeypatch.setattr(verity, "_cached_or_validated", cached_or_validated)
+
+
+def test_cached_claim_is_done_at_once(client, monkeypatch):
+    """A cached claim comes back done with a 200 and the cached body."""
+    _check_returns(monkeypatch, b'{"verdict": "Supported"}')
+
+    response = client.post("/api/verity/verify/jobs", json={"claim": CLAIM})
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "job_id": None,
+        "status": "done",
+        "result": {"verdict": "Supported"},
+    }
+
+
+def test_uncached_claim_is_queued_then_polled(client, monkeypatch):
+    """An uncached claim is queued with a 202 and its result polled."""
+    _check_returns(monkeypatch, None)
+
+    response = client.post("/api/verity/verify/jobs", json={"claim": CLAIM})
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+    assert response.json()["status"] == "pending"
+
+    poll = client.get(f"/api/verity/verify/jobs/{job_id}")
+    assert poll.json() == {"job_id": job_id, "status": "pending"}
+
+    job = verity.jobs.get(job_id)
+    job.status, job.result = "done", b'{"verdict": "Supported"}'
+    poll = client.get(f"/api/verity/verify/jobs/{job_id}")
+    assert poll.json()["result"] == {"verdict": "Supported"}
+
+
+def test_check_errors_are_returned(client, monkeypatch):
+    """Errors from the cache/validation check become the response status."""
+
+    async def cached_or_validated(claim, route):
+        raise HTTPException(status_code=503, detail="rate limited")
+
+    monkeypatch.setattr(verity, "_cached_or_validated", cached_or_validated)
+
+    response = client.post("/api/verity/verify/jobs", json={"claim": CLAIM})
+    assert response.status_code == 503
+
+
+def test_unknown_job_is_404(client):
+    """Polling an unknown or expired job id is a 404."""
+    assert client.get("/api/verity/verify/jobs/missing").status_code == 404